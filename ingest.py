@@ -11,11 +11,12 @@ Usage:
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
-from src.loaders import load_docs, split_docs
-from src.retriever import create_vector_store
+from src.loaders import corpus_hash, load_docs_parallel, split_docs
+from src.retriever import create_local_store, create_vector_store
 from src.utils import authenticate_huggingface, setup_logging
 
 load_dotenv()
@@ -36,12 +37,15 @@ def main() -> None:
     hf_token         = _require_env("HUGGINGFACEHUB_API_TOKEN")
     index_name       = os.getenv("PINECONE_INDEX_NAME", "resumes-index")
     resumes_dir      = os.getenv("RESUMES_DIR", "./resumes")
+    local_index_dir  = os.getenv("LOCAL_INDEX_DIR", "./.local_index")
 
-    logger.info("🔐 Authenticating with HuggingFace...")
-    authenticate_huggingface(token=hf_token)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        logger.info("🔐 Authenticating with HuggingFace...")
+        auth_future = pool.submit(authenticate_huggingface, token=hf_token)
 
-    logger.info("📂 Loading PDFs from '%s'...", resumes_dir)
-    docs = load_docs(resumes_dir)
+        logger.info("📂 Loading PDFs from '%s'...", resumes_dir)
+        docs = load_docs_parallel(resumes_dir)
+        auth_future.result()
 
     if not docs:
         logger.error(
@@ -64,6 +68,9 @@ def main() -> None:
         pinecone_api_key=pinecone_api_key,
     )
 
+    logger.info("💾  Writing local index to '%s'...", local_index_dir)
+    create_local_store(chunks, local_index_dir, corpus_hash=corpus_hash(resumes_dir))
+
     logger.info(
         "🎉  Done! %d resume(s) → %d chunks → Pinecone index '%s'.",
         len(docs), len(chunks), index_name,
@@ -5,13 +5,21 @@ Bootstraps the RAG pipeline and launches the Gradio web UI.
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
 
 import gradio as gr
 from dotenv import load_dotenv
 
-from src.loaders import load_docs, split_docs
-from src.rag import ask_question, get_llm
-from src.retriever import create_vector_store, load_vector_store
+from src.embeddings import get_embeddings
+from src.loaders import corpus_hash, load_docs_parallel, split_docs
+from src.rag import get_chain, get_llm
+from src.retriever import (
+    create_local_store,
+    create_vector_store,
+    load_local_store,
+    load_vector_store,
+)
 from src.utils import authenticate_huggingface, setup_logging
 
 # ---------------------------------------------------------------------------
@@ -35,72 +43,124 @@ def _require_env(name: str) -> str:
     return value
 
 
-PINECONE_API_KEY = _require_env("PINECONE_API_KEY")
-HF_TOKEN        = _require_env("HUGGINGFACEHUB_API_TOKEN")
-INDEX_NAME      = os.getenv("PINECONE_INDEX_NAME", "resumes-index")
-RESUMES_DIR     = os.getenv("RESUMES_DIR", "./resumes")
+UI_CONCURRENCY = int(os.getenv("UI_CONCURRENCY", "8"))
 
 # ---------------------------------------------------------------------------
-# Auth & LLM
+# Auth, LLM & document ingestion
 # ---------------------------------------------------------------------------
-logger.info("🔐 Authenticating with HuggingFace...")
-authenticate_huggingface(token=HF_TOKEN)
 
-logger.info("🤖 Connecting to LLM...")
-llm = get_llm(hf_token=HF_TOKEN)
+def _connect_llm(hf_token: str):
+    logger.info("🔐 Authenticating with HuggingFace...")
+    authenticate_huggingface(token=hf_token)
+    logger.info("🤖 Connecting to LLM...")
+    return get_llm(hf_token=hf_token)
+
+
+def build_chain():
+    """Load or ingest the resumes and return the RAG chain every request reuses."""
+    pinecone_api_key = _require_env("PINECONE_API_KEY")
+    hf_token         = _require_env("HUGGINGFACEHUB_API_TOKEN")
+    index_name       = os.getenv("PINECONE_INDEX_NAME", "resumes-index")
+    resumes_dir      = os.getenv("RESUMES_DIR", "./resumes")
+    local_index_dir  = os.getenv("LOCAL_INDEX_DIR", "./.local_index")
+
+    # Auth, LLM and embedding model load overlap with PDF parsing below.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        llm_future = pool.submit(_connect_llm, hf_token)
+        # Load the shared embedding model now so the first query doesn't pay for it.
+        embeddings_future = pool.submit(get_embeddings)
+
+        # Skip parsing, embedding and upserting when the PDFs match the corpus
+        # the local index was built from.
+        corpus_digest = corpus_hash(resumes_dir)
+        vector_db = (
+            load_local_store(local_index_dir, corpus_hash=corpus_digest)
+            if corpus_digest
+            else None
+        )
+        if vector_db is not None:
+            logger.info("✅ Resumes unchanged since last ingest; using local index.")
+            docs = []
+        else:
+            logger.info("📂 Loading resumes from '%s'...", resumes_dir)
+            docs = load_docs_parallel(resumes_dir)
+        llm = llm_future.result()
+        embeddings_future.result()
+
+    if vector_db is None and not docs:
+        logger.warning(
+            "⚠️  No PDF files found in '%s'. "
+            "Add resumes to that folder and re-run. "
+            "Falling back to existing Pinecone index (queries may return nothing).",
+            resumes_dir,
+        )
+        # The local index describes PDFs that are no longer on disk, so it is
+        # stale by definition; Pinecone is the durable copy.
+        vector_db = load_vector_store(
+            index_name=index_name,
+            pinecone_api_key=pinecone_api_key,
+        )
+    elif vector_db is None:
+        logger.info("✂️  Splitting %d document(s) into chunks...", len(docs))
+        chunks = split_docs(docs)
+        logger.info("📤 Uploading %d chunks to Pinecone index '%s'...", len(chunks), index_name)
+        create_vector_store(
+            chunks=chunks,
+            index_name=index_name,
+            pinecone_api_key=pinecone_api_key,
+        )
+        logger.info("✅ %d resume(s) → %d chunks uploaded to Pinecone.", len(docs), len(chunks))
+        # Queries are answered from the in-process index; Pinecone is the durable copy.
+        vector_db = create_local_store(chunks, local_index_dir, corpus_hash=corpus_digest)
+
+    # Build the RAG chain once; every UI request reuses it.
+    return get_chain(vector_db, llm)
 
-# ---------------------------------------------------------------------------
-# Document ingestion
-# ---------------------------------------------------------------------------
-logger.info("📂 Loading resumes from '%s'...", RESUMES_DIR)
-docs = load_docs(RESUMES_DIR)
-
-if not docs:
-    logger.warning(
-        "⚠️  No PDF files found in '%s'. "
-        "Add resumes to that folder and re-run. "
-        "Falling back to existing Pinecone index (queries may return nothing).",
-        RESUMES_DIR,
-    )
-    vector_db = load_vector_store(
-        index_name=INDEX_NAME,
-        pinecone_api_key=PINECONE_API_KEY,
-    )
-else:
-    logger.info("✂️  Splitting %d document(s) into chunks...", len(docs))
-    chunks = split_docs(docs)
-    logger.info("📤 Uploading %d chunks to Pinecone index '%s'...", len(chunks), INDEX_NAME)
-    vector_db = create_vector_store(
-        chunks=chunks,
-        index_name=INDEX_NAME,
-        pinecone_api_key=PINECONE_API_KEY,
-    )
-    logger.info("✅ %d resume(s) → %d chunks uploaded to Pinecone.", len(docs), len(chunks))
 
 # ---------------------------------------------------------------------------
 # Gradio UI
 # ---------------------------------------------------------------------------
 
-def screen_resume(user_question: str) -> str:
-    """Handler wired to the Gradio submit button."""
-    if not user_question.strip():
-        return "Please enter a question."
-    try:
-        return ask_question(user_question, vector_db, llm)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Error during question answering.")
-        return f"Error: {exc}"
-
-
-with gr.Blocks(theme=gr.themes.Soft()) as demo:
-    gr.Markdown("# 📄 Cloud-Powered Resume Screener (Pinecone Edition)")
-    question = gr.Textbox(
-        label="Question",
-        placeholder="Which candidate is best for Python?",
-    )
-    submit_btn = gr.Button("Analyze", variant="primary")
-    output = gr.Textbox(label="AI Report", lines=10)
-    submit_btn.click(fn=screen_resume, inputs=question, outputs=output)
+def build_ui(rag_chain) -> gr.Blocks:
+    """Create the Gradio app answering questions with rag_chain."""
+
+    async def screen_resume(user_question: str) -> AsyncIterator[str]:
+        """Handler wired to the Gradio submit button; streams the growing answer."""
+        if not user_question.strip():
+            yield "Please enter a question."
+            return
+        answer = ""
+        try:
+            logger.info("Streaming RAG chain with query: %s", user_question)
+            async for chunk in rag_chain.astream(user_question):
+                answer += chunk
+                yield answer
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Error during question answering.")
+            yield f"Error: {exc}"
+
+    with gr.Blocks(theme=gr.themes.Soft()) as demo:
+        gr.Markdown("# 📄 Cloud-Powered Resume Screener (Pinecone Edition)")
+        question = gr.Textbox(
+            label="Question",
+            placeholder="Which candidate is best for Python?",
+        )
+        submit_btn = gr.Button("Analyze", variant="primary")
+        output = gr.Textbox(label="AI Report", lines=10)
+        submit_btn.click(
+            fn=screen_resume,
+            inputs=question,
+            outputs=output,
+            concurrency_limit=UI_CONCURRENCY,
+        )
+
+    # Up to UI_CONCURRENCY questions are answered at once on the event loop;
+    # further requests wait in a bounded queue.
+    demo.queue(default_concurrency_limit=UI_CONCURRENCY, max_size=64)
+    return demo
+
 
+# Start-up only runs in the launching process: PDF parser workers re-import
+# this module and must not bootstrap the app again.
 if __name__ == "__main__":
-    demo.launch(share=False)
+    build_ui(build_chain()).launch(share=False)
@@ -1,3 +1,9 @@
+from .cache import CachedEmbeddings, close_cached_embeddings, get_cached_embeddings
 from .embedding_model import get_embeddings
 
-__all__ = ["get_embeddings"]
\ No newline at end of file
+__all__ = [
+    "get_embeddings",
+    "CachedEmbeddings",
+    "get_cached_embeddings",
+    "close_cached_embeddings",
+]
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Persistent embedding cache keyed by chunk content hash.
+
+Re-ingesting an unchanged corpus would otherwise pay a full forward pass for
+every chunk. Vectors are stored as float16 blobs in a small SQLite database,
+keyed by model name, embedding backend and the SHA-256 of the chunk text.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .embedding_model import resolve_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "./.embed_cache.sqlite"
+
+# Shared wrappers from get_cached_embeddings; each holds its model, so ids stay valid.
+_open_caches: dict = {}
+_open_lock = threading.Lock()
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only runs the underlying model on cache misses.
+
+    Args:
+        embeddings: Model used to embed texts not yet in the cache.
+        model_name: Name stored alongside each vector so different models
+                    never share entries.
+        path:       SQLite file. Falls back to the EMBED_CACHE_PATH env var,
+                    then DEFAULT_CACHE_PATH.
+        backend:    Backend that produced the vectors ("torch" or
+                    "onnx-int8"), stored with the model name so int8 and
+                    full-precision vectors never mix. Falls back to the
+                    EMBED_BACKEND env var, like get_embeddings.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        path: str | None = None,
+        backend: str | None = None,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.backend = resolve_backend(backend)
+        # Rows are namespaced by model and backend in the model column.
+        self._namespace = f"{model_name}|{self.backend}"
+        self.path = path or os.getenv("EMBED_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, hash))"
+        )
+        self._conn.commit()
+
+    def __getstate__(self) -> dict:
+        # The SQLite connection and lock are per process; reopen on unpickle.
+        state = self.__dict__.copy()
+        del state["_conn"], state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    def close(self) -> None:
+        """Close the SQLite connection. The wrapper must not be used afterwards."""
+        with self._lock:
+            self._conn.close()
+
+    def _lookup(self, hashes: List[str]) -> dict:
+        found = {}
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT hash, vector FROM embeddings "
+                f"WHERE model = ? AND hash IN ({placeholders})",
+                [self._namespace, *batch],
+            )
+            for digest, blob in rows:
+                found[digest] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+        return found
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, reusing cached vectors and embedding only the misses."""
+        if not texts:
+            return []
+        hashes = [_content_hash(text) for text in texts]
+        with self._lock:
+            cached = self._lookup(list(set(hashes)))
+
+        misses = {}
+        for digest, text in zip(hashes, texts):
+            if digest not in cached:
+                misses.setdefault(digest, text)
+
+        if misses:
+            vectors = self.embeddings.embed_documents(list(misses.values()))
+            rows = [
+                (self._namespace, digest, np.asarray(vector, dtype=np.float16).tobytes())
+                for digest, vector in zip(misses, vectors)
+            ]
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            # Return what a later hit would read back, not the full-precision vector.
+            cached.update(
+                (digest, np.asarray(vector, dtype=np.float16).astype(np.float32).tolist())
+                for digest, vector in zip(misses, vectors)
+            )
+
+        logger.info(
+            "Embedding cache: %d hit(s), %d miss(es).",
+            len(texts) - len(misses), len(misses),
+        )
+        return [cached[digest] for digest in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+
+def get_cached_embeddings(
+    embeddings: Embeddings,
+    model_name: str,
+    backend: str | None = None,
+) -> CachedEmbeddings:
+    """
+    Return the shared cache wrapper for a model, opening it on first use.
+
+    One CachedEmbeddings, and so one SQLite connection, is kept per model,
+    backend and cache file for the life of the process rather than opening
+    a new connection on every ingest. close_cached_embeddings() closes them.
+
+    Args:
+        embeddings: Model to wrap, normally the shared one from get_embeddings.
+        model_name: Name the vectors are cached under.
+        backend:    "torch" or "onnx-int8". Falls back to EMBED_BACKEND.
+
+    Returns:
+        CachedEmbeddings wrapping embeddings.
+    """
+    backend = resolve_backend(backend)
+    path = os.getenv("EMBED_CACHE_PATH", DEFAULT_CACHE_PATH)
+    key = (id(embeddings), model_name, backend, path)
+    with _open_lock:
+        if key not in _open_caches:
+            _open_caches[key] = CachedEmbeddings(embeddings, model_name, path=path, backend=backend)
+        return _open_caches[key]
+
+
+def close_cached_embeddings() -> None:
+    """Close every shared CachedEmbeddings and forget them."""
+    with _open_lock:
+        for cached in _open_caches.values():
+            cached.close()
+        _open_caches.clear()
@@ -1,27 +1,81 @@
 """
 Embedding model configuration and factory.
 """
+import functools
 import logging
+import os
+import threading
 
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 EMBEDDING_DIMENSION = 384
+EMBEDDING_BATCH_SIZE = 64
 
+# lru_cache does not stop two threads from loading the same model at once.
+_load_lock = threading.Lock()
 
-def get_embeddings(model_name: str = DEFAULT_EMBEDDING_MODEL) -> HuggingFaceEmbeddings:
+
+def _default_device() -> str:
+    """Use the GPU when torch can see one, otherwise the CPU."""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def resolve_backend(backend: str | None = None) -> str:
+    """Return the embedding backend to use, defaulting to EMBED_BACKEND or "torch"."""
+    return backend or os.getenv("EMBED_BACKEND", "torch")
+
+
+def get_embeddings(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    backend: str | None = None,
+) -> Embeddings:
     """
-    Create and return a HuggingFace embedding model.
+    Return the shared HuggingFace embedding model, loading it on first use.
+
+    Models are cached per (model_name, backend) for the life of the process,
+    so every caller shares one set of weights. Texts are encoded in batches
+    of EMBEDDING_BATCH_SIZE and returned L2-normalised, so inner product
+    equals cosine similarity.
 
     Args:
         model_name: HuggingFace model identifier for sentence embeddings.
+        backend:    "torch" (default) or "onnx-int8". Falls back to the
+                    EMBED_BACKEND environment variable.
 
     Returns:
-        HuggingFaceEmbeddings instance ready for use.
+        Embeddings instance ready for use.
     """
-    logger.info("Loading embedding model: %s", model_name)
-    embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    backend = resolve_backend(backend)
+    with _load_lock:
+        return _load_embeddings(model_name, backend)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_embeddings(model_name: str, backend: str) -> Embeddings:
+    logger.info("Loading embedding model: %s (backend: %s)", model_name, backend)
+    if backend == "onnx-int8":
+        from .onnx_minilm import OnnxInt8Embeddings
+        return OnnxInt8Embeddings(model_name, batch_size=EMBEDDING_BATCH_SIZE)
+    if backend != "torch":
+        raise ValueError(
+            f"Unknown embedding backend '{backend}'. Use 'torch' or 'onnx-int8'."
+        )
+
+    embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": _default_device()},
+        encode_kwargs={
+            "batch_size": EMBEDDING_BATCH_SIZE,
+            "normalize_embeddings": True,
+        },
+    )
     logger.info("Embedding model loaded successfully.")
-    return embeddings
\ No newline at end of file
+    return embeddings
@@ -0,0 +1,96 @@
+"""
+Int8-quantised ONNX Runtime backend for sentence-transformer embeddings.
+
+Selected with EMBED_BACKEND=onnx-int8. The model is exported to ONNX and
+dynamically quantised (per-channel int8, AVX-512 VNNI kernels) on first use;
+the quantised copy is kept on disk so later runs load it directly.
+
+Requires the optional ``optimum[onnxruntime]`` extra.
+"""
+import logging
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONNX_DIR = "./.onnx_models"
+QUANTIZED_FILE = "model_quantized.onnx"
+MAX_SEQ_LENGTH = 256
+
+
+class OnnxInt8Embeddings(Embeddings):
+    """
+    Drop-in replacement for HuggingFaceEmbeddings running an int8 ONNX model.
+
+    Args:
+        model_name: HuggingFace model identifier for sentence embeddings.
+        cache_dir:  Folder holding the quantised export.
+        batch_size: Texts tokenised and run per ONNX session call.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str = DEFAULT_ONNX_DIR,
+        batch_size: int = 64,
+    ) -> None:
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            from transformers import AutoTokenizer
+        except ImportError as exc:
+            raise ImportError(
+                "EMBED_BACKEND=onnx-int8 requires optimum with ONNX Runtime. "
+                "Install it with: pip install 'optimum[onnxruntime]'"
+            ) from exc
+
+        self.batch_size = batch_size
+        model_dir = os.path.join(cache_dir, model_name.replace("/", "__") + "-int8")
+
+        if not os.path.exists(os.path.join(model_dir, QUANTIZED_FILE)):
+            logger.info("Exporting and quantising '%s' to int8 ONNX...", model_name)
+            model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, provider="CPUExecutionProvider"
+            )
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=model_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=True
+                ),
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=QUANTIZED_FILE, provider="CPUExecutionProvider"
+        )
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        logger.info("Loaded int8 ONNX embedding model from '%s'.", model_dir)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Mean-pool token states and L2-normalise, as sentence-transformers does."""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            inputs = self._tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            hidden = np.asarray(self._model(**inputs).last_hidden_state)
+            mask = inputs["attention_mask"][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled / np.linalg.norm(pooled, axis=1, keepdims=True))
+        return np.vstack(batches)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
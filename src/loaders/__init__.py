@@ -1,3 +1,17 @@
-from .document_loader import load_docs, split_docs
+from .document_loader import (
+    FitzPDFLoader,
+    corpus_hash,
+    fast_split,
+    load_docs,
+    load_docs_parallel,
+    split_docs,
+)
 
-__all__ = ["load_docs", "split_docs"]
\ No newline at end of file
+__all__ = [
+    "FitzPDFLoader",
+    "corpus_hash",
+    "fast_split",
+    "load_docs",
+    "load_docs_parallel",
+    "split_docs",
+]
\ No newline at end of file
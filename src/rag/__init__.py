@@ -1,4 +1,31 @@
-from .chain import build_rag_chain, ask_question
+from .chain import (
+    FastRAG,
+    build_rag_chain,
+    get_chain,
+    clear_chain_cache,
+    ask_question,
+    ask_question_stream,
+    ask_questions,
+    aask_question,
+    aask_questions,
+    ask_many,
+    aask_question_stream,
+)
+from .cache import SemanticCache
 from .llm import get_llm
 
-__all__ = ["build_rag_chain", "ask_question", "get_llm"]
\ No newline at end of file
+__all__ = [
+    "FastRAG",
+    "build_rag_chain",
+    "get_chain",
+    "clear_chain_cache",
+    "ask_question",
+    "ask_question_stream",
+    "ask_questions",
+    "aask_question",
+    "aask_questions",
+    "ask_many",
+    "aask_question_stream",
+    "SemanticCache",
+    "get_llm",
+]
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Semantic response cache for repeated and near-duplicate questions.
+
+HR users often re-ask the same question in different words ("Who knows
+Python?" / "Find Python devs"). Answers are stored next to the normalised
+query embedding; a new query whose cosine similarity to a stored one reaches
+the threshold is answered from the cache, skipping retrieval and generation.
+"""
+import logging
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Fixed-size cache of answers looked up by query embedding similarity.
+
+    Lookups are a single matrix-vector product over the stored embeddings.
+    When full, the oldest entry is overwritten.
+
+    Args:
+        embed_fn:  Maps a query string to its embedding, e.g.
+                   ``embeddings.embed_query``.
+        threshold: Minimum cosine similarity for a cache hit.
+        maxsize:   Maximum number of cached answers.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        threshold: float = 0.95,
+        maxsize: int = 256,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._answers: List[Optional[str]] = [None] * maxsize
+        self._size = 0
+        self._next = 0
+        # The query embedded by the last lookup, so a miss followed by put()
+        # embeds it only once.
+        self._last: tuple = (None, None)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _embed(self, query: str) -> np.ndarray:
+        key = query.strip()
+        last_key, last_vector = self._last
+        if key == last_key:
+            return last_vector
+        vector = np.asarray(self.embed_fn(key), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        self._last = (key, vector)
+        return vector
+
+    def get(self, query: str) -> Optional[str]:
+        """
+        Return the cached answer for a sufficiently similar query.
+
+        Args:
+            query: Natural-language question.
+
+        Returns:
+            The stored answer, or None on a miss.
+        """
+        vector = self._embed(query)
+        with self._lock:
+            if not self._size:
+                return None
+            scores = self._matrix[:self._size] @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            logger.info("Semantic cache hit (similarity %.3f).", scores[best])
+            return self._answers[best]
+
+    def put(self, query: str, answer: str) -> None:
+        """
+        Store an answer for a query, evicting the oldest entry when full.
+
+        Args:
+            query:  Natural-language question.
+            answer: Answer to return for this and similar questions.
+        """
+        vector = self._embed(query)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self.maxsize, len(vector)), dtype=np.float32)
+            self._matrix[self._next] = vector
+            self._answers[self._next] = answer
+            self._next = (self._next + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
+
+    def clear(self) -> None:
+        """Drop every cached answer (e.g. after re-ingesting resumes)."""
+        with self._lock:
+            self._matrix = None
+            self._answers = [None] * self.maxsize
+            self._size = 0
+            self._next = 0
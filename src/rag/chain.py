@@ -1,22 +1,252 @@
 """
 RAG chain construction and query execution.
 """
+import asyncio
+import functools
 import logging
-from typing import Any
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_pinecone import PineconeVectorStore
 
+from src.rag.cache import SemanticCache
+
 logger = logging.getLogger(__name__)
 
-HR_PROMPT_TEMPLATE = (
+# Static instructions come first and the per-query slots last, so providers
+# that cache prompt prefixes can reuse everything before {context}.
+HR_SYSTEM_PREFIX = (
     "You are an expert HR assistant. "
     "Answer based ONLY on the provided resumes:\n"
+)
+HR_DYNAMIC_SUFFIX = (
     "Context: {context}\n\n"
     "Question: {input}"
 )
+HR_PROMPT_TEMPLATE = HR_SYSTEM_PREFIX + HR_DYNAMIC_SUFFIX
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_prompt(prompt_template: str) -> PromptTemplate:
+    """Parse and validate a template once; later chains reuse the result."""
+    prompt = PromptTemplate.from_template(prompt_template)
+    missing = {"context", "input"} - set(prompt.input_variables)
+    if missing:
+        raise ValueError(
+            f"Prompt template is missing slot(s): {', '.join(sorted(missing))}."
+        )
+    return prompt
+
+
+_DEFAULT_PROMPT = _compile_prompt(HR_PROMPT_TEMPLATE)
+
+# Built chains keyed by (id(vector_store), id(llm), k, prompt_template,
+# ann_params). Each entry also holds the store and LLM so their ids cannot
+# be recycled while the entry is alive.
+_CHAIN_CACHE_SIZE = 32
+_chain_cache: "OrderedDict[tuple, tuple[Any, Any, Any]]" = OrderedDict()
+
+# Retrievers keyed by (id(vector_store), search kwargs). Entries disappear once no chain
+# holds the retriever any more.
+_RETRIEVER_CACHE: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+
+
+# FAISS stores over an IVF index -> (lock, IVF index, nprobe the index had
+# when first seen). Every chain search pins its own nprobe under the lock.
+_IVF_STATE: "weakref.WeakKeyDictionary[Any, tuple]" = weakref.WeakKeyDictionary()
+
+
+def _ivf_state(vector_store: Any) -> Optional[tuple]:
+    """Return (lock, IVF index, default nprobe) for a FAISS IVF store, else None."""
+    try:
+        from langchain_community.vectorstores import FAISS
+    except ImportError:  # pragma: no cover - langchain_community is a dependency
+        return None
+    if not isinstance(vector_store, FAISS):
+        return None
+    state = _IVF_STATE.get(vector_store)
+    if state is None:
+        import faiss
+
+        try:
+            ivf = faiss.extract_index_ivf(vector_store.index)
+        except RuntimeError:  # flat or other non-IVF index
+            return None
+        state = _IVF_STATE.setdefault(vector_store, (threading.Lock(), ivf, ivf.nprobe))
+    return state
+
+
+def _get_retriever(vector_store: Any, k: int, ann_params: Optional[dict] = None) -> Any:
+    """Return the retriever for a store, k and ANN parameters, creating it on first use."""
+    # nprobe is applied per search by the chain, not passed to the store.
+    search_kwargs = {**(ann_params or {}), "k": k}
+    search_kwargs.pop("nprobe", None)
+    key = (id(vector_store), tuple(sorted(search_kwargs.items())))
+    retriever = _RETRIEVER_CACHE.get(key)
+    # Guard against a recycled id: a real retriever must point at this store.
+    if retriever is not None and (
+        not isinstance(retriever, VectorStoreRetriever) or retriever.vectorstore is vector_store
+    ):
+        return retriever
+    retriever = vector_store.as_retriever(search_kwargs=search_kwargs)
+    _RETRIEVER_CACHE[key] = retriever
+    return retriever
+
+
+def _direct_search(retriever: Any, nprobe: Optional[int] = None) -> Optional[tuple]:
+    """
+    Return (search, asearch) callables that skip the retriever runnable.
+
+    For a plain similarity VectorStoreRetriever the store is queried directly,
+    bypassing the callback manager set up on every retriever.invoke. Returns
+    None for any other retriever.
+
+    Over a FAISS IVF index each search sets the index's nprobe to ``nprobe``
+    (or the value the index started with) under a per-store lock and
+    restores it afterwards, so chains with different settings can share a
+    store.
+    """
+    if not isinstance(retriever, VectorStoreRetriever) or retriever.search_type != "similarity":
+        return None
+    store = retriever.vectorstore
+    search_kwargs = dict(retriever.search_kwargs)
+    state = _ivf_state(store)
+    if state is None:
+        return (
+            lambda query: store.similarity_search(query, **search_kwargs),
+            lambda query: store.asimilarity_search(query, **search_kwargs),
+        )
+
+    lock, ivf, default_nprobe = state
+    probes = default_nprobe if nprobe is None else nprobe
+
+    def search(query: str) -> Any:
+        with lock:
+            previous, ivf.nprobe = ivf.nprobe, probes
+            try:
+                return store.similarity_search(query, **search_kwargs)
+            finally:
+                ivf.nprobe = previous
+
+    async def asearch(query: str) -> Any:
+        return await asyncio.to_thread(search, query)
+
+    return search, asearch
+
+
+RAGInput = Union[str, Dict[str, Any]]
+RAGOutput = Union[str, Dict[str, Any]]
+
+
+def _content(result: Any) -> str:
+    """Chat models return a message; plain LLMs return the string itself."""
+    return getattr(result, "content", result)
+
+
+class FastRAG(Runnable[RAGInput, RAGOutput]):
+    """
+    Retrieve-format-generate chain specialised for a fixed prompt template.
+
+    Equivalent to ``{"context": retriever, "input": passthrough} | prompt |
+    llm | StrOutputParser()``, but the bound methods are captured once at
+    construction so each query costs one retrieval, one ``str.format`` and
+    one LLM call, without walking a runnable graph. Similarity retrievers are
+    fused into the prompt build: the store is searched directly and page
+    contents are joined straight into the context string.
+
+    invoke() and ainvoke() take either a bare query string, returning the
+    answer string, or a ``{"input": query}`` payload, returning
+    ``{"input", "context", "answer"}`` like LangChain's retrieval chains.
+    stream() and astream() take the same inputs: a query string yields answer
+    strings, while a payload yields ``{"input", "context"}`` and then one
+    ``{"answer": piece}`` per chunk.
+
+    Args:
+        retriever:       Runnable mapping a query to a list of Documents.
+        llm:             LangChain-compatible LLM or chat model.
+        prompt_template: Template with {context} and {input} slots; parsed and
+                         validated once per distinct template.
+        nprobe:          IVF partitions to visit per search when the retriever
+                         wraps a FAISS IVF index.
+    """
+
+    def __init__(
+        self, retriever: Any, llm: Any, prompt_template: str, nprobe: Optional[int] = None
+    ) -> None:
+        self.retriever = retriever
+        self.llm = llm
+        self.prompt_template = prompt_template
+        self.prompt = _compile_prompt(prompt_template)
+        self._retrieve, self._aretrieve = _direct_search(retriever, nprobe) or (
+            retriever.invoke,
+            retriever.ainvoke,
+        )
+        self._join = "\n\n".join
+        self._format = prompt_template.format
+        self._generate = llm.invoke
+
+    def _render(self, query: str, docs: Any) -> str:
+        context = self._join([doc.page_content for doc in docs])
+        return self._format(context=context, input=query)
+
+    def _prompt(self, query: str) -> str:
+        return self._render(query, self._retrieve(query))
+
+    async def _aprompt(self, query: str) -> str:
+        return self._render(query, await self._aretrieve(query))
+
+    def invoke(
+        self, input: RAGInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> RAGOutput:
+        if isinstance(input, dict):
+            query = input["input"]
+            docs = self._retrieve(query)
+            answer = _content(self._generate(self._render(query, docs)))
+            return {"input": query, "context": docs, "answer": answer}
+        return _content(self._generate(self._prompt(input)))
+
+    def stream(
+        self, input: RAGInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[RAGOutput]:
+        """Yield the answer piece by piece as the LLM generates it."""
+        if isinstance(input, dict):
+            query = input["input"]
+            docs = self._retrieve(query)
+            yield {"input": query, "context": docs}
+            for chunk in self.llm.stream(self._render(query, docs)):
+                yield {"answer": _content(chunk)}
+            return
+        for chunk in self.llm.stream(self._prompt(input)):
+            yield _content(chunk)
+
+    async def ainvoke(
+        self, input: RAGInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> RAGOutput:
+        if isinstance(input, dict):
+            query = input["input"]
+            docs = await self._aretrieve(query)
+            answer = _content(await self.llm.ainvoke(self._render(query, docs)))
+            return {"input": query, "context": docs, "answer": answer}
+        return _content(await self.llm.ainvoke(await self._aprompt(input)))
+
+    async def astream(
+        self, input: RAGInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[RAGOutput]:
+        """Async counterpart of stream(); retrieval and generation never block the loop."""
+        if isinstance(input, dict):
+            query = input["input"]
+            docs = await self._aretrieve(query)
+            yield {"input": query, "context": docs}
+            async for chunk in self.llm.astream(self._render(query, docs)):
+                yield {"answer": _content(chunk)}
+            return
+        async for chunk in self.llm.astream(await self._aprompt(input)):
+            yield _content(chunk)
 
 
 def build_rag_chain(
@@ -24,6 +254,7 @@ def build_rag_chain(
     llm: Any,
     k: int = 5,
     prompt_template: str = HR_PROMPT_TEMPLATE,
+    ann_params: Optional[dict] = None,
 ) -> Any:
     """
     Assemble a retrieval-augmented generation (RAG) chain.
@@ -32,30 +263,75 @@ def build_rag_chain(
         vector_store:    Populated PineconeVectorStore used as the retriever.
         llm:             LangChain-compatible chat LLM.
         k:               Number of documents to retrieve per query.
-        prompt_template: Jinja-style template with {context} and {input} slots.
+        prompt_template: str.format-style template with {context} and {input} slots.
+        ann_params:      Extra retriever search kwargs, such as ``fetch_k``
+                         (candidates fetched before a metadata filter is
+                         applied). ``nprobe`` (IVF partitions visited) is
+                         applied by the chain on each search of a FAISS IVF
+                         index; chains without it search with the index's
+                         original nprobe.
 
     Returns:
-        A LangChain runnable chain that accepts a query string and returns a
+        A FastRAG runnable that accepts a query string and returns a
         plain-text answer.
     """
-    retriever = vector_store.as_retriever(search_kwargs={"k": k})
-    prompt = ChatPromptTemplate.from_template(prompt_template)
+    nprobe = (ann_params or {}).get("nprobe")
+    if nprobe is not None and _ivf_state(vector_store) is None:
+        raise ValueError("nprobe is only supported for FAISS vector stores over an IVF index.")
+    retriever = _get_retriever(vector_store, k, ann_params)
+    chain = FastRAG(retriever, llm, prompt_template, nprobe=nprobe)
+    logger.info("RAG chain built with k=%d.", k)
+    return chain
+
+
+def get_chain(
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+    prompt_template: str = HR_PROMPT_TEMPLATE,
+    ann_params: Optional[dict] = None,
+) -> Any:
+    """
+    Return a cached RAG chain, building it on first use.
 
-    chain = (
-        {"context": retriever, "input": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+    Args:
+        vector_store:    Populated PineconeVectorStore used as the retriever.
+        llm:             LangChain-compatible chat LLM.
+        k:               Number of documents to retrieve per query.
+        prompt_template: Template with {context} and {input} slots.
+        ann_params:      Extra ANN search kwargs; see build_rag_chain.
+
+    Returns:
+        The chain built by build_rag_chain for this configuration.
+    """
+    ann_key = tuple(sorted((ann_params or {}).items()))
+    key = (id(vector_store), id(llm), k, prompt_template, ann_key)
+    entry = _chain_cache.get(key)
+    if entry is not None:
+        _chain_cache.move_to_end(key)
+        return entry[2]
+
+    chain = build_rag_chain(
+        vector_store, llm, k=k, prompt_template=prompt_template, ann_params=ann_params
     )
-    logger.info("RAG chain built with k=%d.", k)
+    _chain_cache[key] = (vector_store, llm, chain)
+    if len(_chain_cache) > _CHAIN_CACHE_SIZE:
+        _chain_cache.popitem(last=False)
     return chain
 
 
+def clear_chain_cache() -> None:
+    """Drop every cached chain and retriever (e.g. after re-ingesting resumes)."""
+    _chain_cache.clear()
+    _RETRIEVER_CACHE.clear()
+
+
 def ask_question(
     query: str,
     vector_store: PineconeVectorStore,
     llm: Any,
     k: int = 5,
+    cache: Optional[SemanticCache] = None,
 ) -> str:
     """
     Run a single question through the RAG chain and return the answer.
@@ -65,11 +341,177 @@ def ask_question(
         vector_store: Populated PineconeVectorStore.
         llm:          LangChain-compatible chat LLM.
         k:            Number of documents to retrieve.
+        cache:        Optional SemanticCache; a near-duplicate of an earlier
+                      question is answered from it without retrieval or an
+                      LLM call. Use one cache per store/LLM configuration.
 
     Returns:
         Plain-text answer string produced by the LLM.
     """
-    chain = build_rag_chain(vector_store, llm, k=k)
+    if cache is not None:
+        cached = cache.get(query)
+        if cached is not None:
+            return cached
+
+    chain = get_chain(vector_store, llm, k=k)
     logger.info("Invoking RAG chain with query: %s", query)
-    answer = chain.invoke(query)
-    return answer
\ No newline at end of file
+    answer = chain.invoke({"input": query})["answer"]
+    if cache is not None:
+        cache.put(query, answer)
+    return answer
+
+
+def ask_question_stream(
+    query: str,
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+) -> Iterator[str]:
+    """
+    Run a question through the RAG chain, yielding answer chunks as they arrive.
+
+    Args:
+        query:        Natural-language question about the resumes.
+        vector_store: Populated PineconeVectorStore.
+        llm:          LangChain-compatible chat LLM.
+        k:            Number of documents to retrieve.
+
+    Yields:
+        Successive pieces of the answer; concatenated they form the full text.
+    """
+    chain = get_chain(vector_store, llm, k=k)
+    logger.info("Streaming RAG chain with query: %s", query)
+    yield from chain.stream(query)
+
+
+async def aask_question(
+    query: str,
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+) -> str:
+    """
+    Async counterpart of ask_question for use inside an event loop.
+
+    Args:
+        query:        Natural-language question about the resumes.
+        vector_store: Populated PineconeVectorStore.
+        llm:          LangChain-compatible chat LLM.
+        k:            Number of documents to retrieve.
+
+    Returns:
+        Plain-text answer string produced by the LLM.
+    """
+    chain = get_chain(vector_store, llm, k=k)
+    logger.info("Invoking RAG chain (async) with query: %s", query)
+    result = await chain.ainvoke({"input": query})
+    return result["answer"]
+
+
+async def aask_questions(
+    queries: List[str],
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+    max_concurrency: Optional[int] = None,
+) -> List[str]:
+    """
+    Answer several questions concurrently against one RAG chain.
+
+    LLM calls are network-bound, so overlapping them gives close to
+    len(queries)-fold throughput over a sequential loop.
+
+    Args:
+        queries:         Natural-language questions about the resumes.
+        vector_store:    Populated PineconeVectorStore.
+        llm:             LangChain-compatible chat LLM.
+        k:               Number of documents to retrieve per question.
+        max_concurrency: Cap on in-flight questions; unlimited when None.
+
+    Returns:
+        Answers in the same order as ``queries``.
+    """
+    if not queries:
+        return []
+    chain = get_chain(vector_store, llm, k=k)
+    logger.info("Invoking RAG chain (async batch) with %d queries.", len(queries))
+    return await chain.abatch(list(queries), config={"max_concurrency": max_concurrency})
+
+
+async def ask_many(
+    queries: List[str],
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+    max_concurrency: int = 16,
+) -> List[str]:
+    """
+    aask_questions with a default cap of 16 questions in flight.
+
+    Keeps a large batch from opening one LLM request per question at once.
+
+    Args:
+        queries:         Natural-language questions about the resumes.
+        vector_store:    Populated PineconeVectorStore.
+        llm:             LangChain-compatible chat LLM.
+        k:               Number of documents to retrieve per question.
+        max_concurrency: Maximum questions being answered at once.
+
+    Returns:
+        Answers in the same order as ``queries``.
+    """
+    return await aask_questions(
+        queries, vector_store, llm, k=k, max_concurrency=max_concurrency
+    )
+
+
+def ask_questions(
+    queries: List[str],
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+    max_concurrency: Optional[int] = None,
+) -> List[str]:
+    """
+    Synchronous wrapper around aask_questions.
+
+    Must not be called from inside a running event loop; await
+    aask_questions there instead.
+
+    Args:
+        queries:         Natural-language questions about the resumes.
+        vector_store:    Populated PineconeVectorStore.
+        llm:             LangChain-compatible chat LLM.
+        k:               Number of documents to retrieve per question.
+        max_concurrency: Cap on in-flight questions; unlimited when None.
+
+    Returns:
+        Answers in the same order as ``queries``.
+    """
+    return asyncio.run(
+        aask_questions(queries, vector_store, llm, k=k, max_concurrency=max_concurrency)
+    )
+
+
+async def aask_question_stream(
+    query: str,
+    vector_store: PineconeVectorStore,
+    llm: Any,
+    k: int = 5,
+) -> AsyncIterator[str]:
+    """
+    Async counterpart of ask_question_stream.
+
+    Args:
+        query:        Natural-language question about the resumes.
+        vector_store: Populated PineconeVectorStore.
+        llm:          LangChain-compatible chat LLM.
+        k:            Number of documents to retrieve.
+
+    Yields:
+        Successive pieces of the answer; concatenated they form the full text.
+    """
+    chain = get_chain(vector_store, llm, k=k)
+    logger.info("Streaming RAG chain (async) with query: %s", query)
+    async for chunk in chain.astream(query):
+        yield chunk
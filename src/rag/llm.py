@@ -1,6 +1,7 @@
 """
 LLM configuration and factory for the resume screener.
 """
+import functools
 import logging
 import os
 
@@ -16,9 +17,13 @@ def get_llm(
     max_new_tokens: int = 512,
     temperature: float = 0.1,
     hf_token: str | None = None,
-) -> ChatHuggingFace:
+    chat: bool | None = None,
+) -> ChatHuggingFace | HuggingFaceEndpoint:
     """
-    Build and return a ChatHuggingFace LLM connected to the HF Inference API.
+    Return an LLM connected to the HF Inference API.
+
+    Clients are cached per configuration, so repeated calls share one
+    endpoint and its HTTP session.
 
     Args:
         model_id:       HuggingFace model repository identifier.
@@ -26,9 +31,14 @@ def get_llm(
         temperature:    Sampling temperature (lower = more deterministic).
         hf_token:       HuggingFace API token. Falls back to the
                         HUGGINGFACEHUB_API_TOKEN environment variable.
+        chat:           Wrap the endpoint in ChatHuggingFace. Defaults to
+                        True unless the CHAT_STYLE env var is 'off', in which
+                        case the prompt string is sent to the endpoint as-is,
+                        skipping the chat template and message conversion.
 
     Returns:
-        A ChatHuggingFace instance ready to use in a LangChain chain.
+        A ChatHuggingFace instance, or the bare HuggingFaceEndpoint when chat
+        is off; either is ready to use in a LangChain chain.
     """
     token = hf_token or os.getenv("HUGGINGFACEHUB_API_TOKEN")
     if not token:
@@ -37,6 +47,19 @@ def get_llm(
             "Set HUGGINGFACEHUB_API_TOKEN or pass hf_token explicitly."
         )
 
+    if chat is None:
+        chat = os.getenv("CHAT_STYLE", "on").strip().lower() != "off"
+    return _build_llm(model_id, max_new_tokens, temperature, token, chat)
+
+
+@functools.lru_cache(maxsize=4)
+def _build_llm(
+    model_id: str,
+    max_new_tokens: int,
+    temperature: float,
+    token: str,
+    chat: bool,
+) -> ChatHuggingFace | HuggingFaceEndpoint:
     logger.info("Connecting to HuggingFace Inference API for model: %s", model_id)
 
     raw_llm = HuggingFaceEndpoint(
@@ -45,7 +68,8 @@ def get_llm(
         max_new_tokens=max_new_tokens,
         temperature=temperature,
         huggingfacehub_api_token=token,
+        streaming=True,
     )
-    llm = ChatHuggingFace(llm=raw_llm)
+    llm = ChatHuggingFace(llm=raw_llm) if chat else raw_llm
     logger.info("LLM connection ready.")
-    return llm
\ No newline at end of file
+    return llm
@@ -1,3 +1,10 @@
 from .vector_store import create_vector_store, load_vector_store
+from .local_store import LocalVectorStore, create_local_store, load_local_store
 
-__all__ = ["create_vector_store", "load_vector_store"]
\ No newline at end of file
+__all__ = [
+    "create_vector_store",
+    "load_vector_store",
+    "LocalVectorStore",
+    "create_local_store",
+    "load_local_store",
+]
\ No newline at end of file
@@ -0,0 +1,396 @@
+"""
+In-process vector store used on the query hot path.
+
+The resume corpus is small (hundreds of chunks), so an exact inner-product
+search over a NumPy matrix answers k-NN without a network round-trip to
+Pinecone. Pinecone remains the durable copy; this store is rebuilt at ingest
+and persisted to disk so later runs can load it directly.
+
+Vectors can optionally be kept as int8 codes with a per-dimension scale
+(symmetric scalar quantisation), cutting the stored and memory-mapped size
+by 4x with near-identical ranking for normalised embeddings. Codes are
+widened to float32 one fixed-size row block at a time while scoring, so a
+query never materialises a float copy of the whole matrix (or pulls a
+memory-mapped index into the heap).
+
+Persisted vectors are memory-mapped on load, so start-up cost is a page-table
+setup and the OS page cache keeps the matrix warm across restarts.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from src.embeddings.cache import get_cached_embeddings
+from src.embeddings.embedding_model import (
+    DEFAULT_EMBEDDING_MODEL,
+    get_embeddings,
+    resolve_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+SCALE_FILE = "scale.npy"
+DOCUMENTS_FILE = "documents.pkl"
+CORPUS_HASH_FILE = "corpus.sha256"
+QUERY_CACHE_SIZE = 1024
+# Rows of int8 codes widened to float32 per scoring step (1.5 MB at 384 dims).
+SCORE_BLOCK_ROWS = 1024
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so inner product equals cosine similarity."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Map float vectors to int8 codes with a per-dimension scale."""
+    scale = np.abs(vectors).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+    return codes, scale.astype(np.float32)
+
+
+def _atomic_write(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """
+    Write a file via a temp file and rename.
+
+    Readers see either the old or the new file, never a partial one, and
+    live memory maps of the old file stay valid.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            write(fh)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _atomic_save(path: str, array: np.ndarray) -> None:
+    """Write an .npy file atomically."""
+    _atomic_write(path, lambda fh: np.save(fh, np.ascontiguousarray(array)))
+
+
+def _score_blocked(codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Inner products of int8 rows with a float32 query, in bounded memory."""
+    rows = len(codes)
+    scores = np.empty(rows, dtype=np.float32)
+    block = np.empty((min(SCORE_BLOCK_ROWS, rows), codes.shape[1]), dtype=np.float32)
+    for start in range(0, rows, SCORE_BLOCK_ROWS):
+        stop = min(start + SCORE_BLOCK_ROWS, rows)
+        buf = block[:stop - start]
+        np.copyto(buf, codes[start:stop], casting="unsafe")
+        np.dot(buf, query, out=scores[start:stop])
+    return scores
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Cosine k-NN over an in-memory matrix of document embeddings.
+
+    Args:
+        embedding: Embedding model used for documents and queries.
+        vectors:   L2-normalised float32 embeddings, or int8 codes when
+                   ``scale`` is given. Stored as-is; add_texts normalises.
+        documents: Documents aligned with the rows of ``vectors``.
+        scale:     Per-dimension scale of int8 codes.
+        quantize:  Store vectors as int8 codes instead of float32.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        vectors: Optional[np.ndarray] = None,
+        documents: Optional[List[Document]] = None,
+        scale: Optional[np.ndarray] = None,
+        quantize: bool = False,
+    ) -> None:
+        self._embedding = embedding
+        # Recently seen queries -> embedding, most recently used last.
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._documents: List[Document] = list(documents or [])
+        self._scale: Optional[np.ndarray] = None
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self.quantize = quantize or scale is not None
+        if vectors is not None and len(vectors):
+            if scale is not None:
+                self._vectors = np.ascontiguousarray(vectors, dtype=np.int8)
+                self._scale = np.asarray(scale, dtype=np.float32)
+            else:
+                self._set_vectors(np.asarray(vectors, dtype=np.float32))
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled; the query cache is cheap to rebuild.
+        state = self.__dict__.copy()
+        del state["_query_cache_lock"]
+        state["_query_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._query_cache_lock = threading.Lock()
+
+    def _set_vectors(self, vectors: np.ndarray) -> None:
+        if self.quantize:
+            codes, self._scale = _quantize(vectors)
+            self._vectors = np.ascontiguousarray(codes)
+        else:
+            self._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def _float_vectors(self) -> np.ndarray:
+        if self._scale is None:
+            return self._vectors
+        return self._vectors.astype(np.float32) * self._scale
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Embed texts and append them to the in-memory matrix."""
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+
+        vectors = _normalise(
+            np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        )
+        if len(self._documents):
+            vectors = np.vstack([self._float_vectors(), vectors])
+        self._set_vectors(vectors)
+        self._documents.extend(
+            Document(id=doc_id, page_content=text, metadata=metadata)
+            for doc_id, text, metadata in zip(ids, texts, metadatas)
+        )
+        return ids
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: List[float], k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """Return the k documents with the highest cosine similarity."""
+        if not self._documents:
+            return []
+        query = _normalise(np.asarray(embedding, dtype=np.float32))
+        if self._scale is not None:
+            # Fold the scale into the query instead of dequantising the matrix.
+            scores = _score_blocked(self._vectors, query * self._scale)
+        else:
+            scores = self._vectors @ query
+        if k < len(scores):
+            # Select the k best in O(n), then order only those.
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return [(self._documents[i], float(scores[i])) for i in top]
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing the vector for recently repeated questions."""
+        key = query.strip()
+        with self._query_cache_lock:
+            vector = self._query_cache.get(key)
+            if vector is not None:
+                self._query_cache.move_to_end(key)
+                return vector
+
+        vector = np.asarray(self._embedding.embed_query(key), dtype=np.float32)
+        with self._query_cache_lock:
+            self._query_cache[key] = vector
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embed_query(query), k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        return [
+            doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k)
+        ]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        *,
+        quantize: bool = False,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(embedding, quantize=quantize)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def save(self, directory: str, corpus_hash: Optional[str] = None) -> None:
+        """
+        Persist vectors and documents to a directory.
+
+        The corpus hash is removed before anything else is written and
+        recorded only once every file is in place, so a crash part-way
+        through never leaves a hash vouching for mismatched files.
+
+        Args:
+            directory:   Target folder; created if it does not exist.
+            corpus_hash: Fingerprint of the source PDFs to record with the
+                         index; any previous fingerprint is dropped.
+        """
+        os.makedirs(directory, exist_ok=True)
+        hash_path = os.path.join(directory, CORPUS_HASH_FILE)
+        if os.path.exists(hash_path):
+            os.remove(hash_path)
+
+        _atomic_save(os.path.join(directory, VECTORS_FILE), self._vectors)
+        scale_path = os.path.join(directory, SCALE_FILE)
+        if self._scale is not None:
+            _atomic_save(scale_path, self._scale)
+        elif os.path.exists(scale_path):
+            os.remove(scale_path)
+        _atomic_write(
+            os.path.join(directory, DOCUMENTS_FILE),
+            lambda fh: pickle.dump(self._documents, fh),
+        )
+        if corpus_hash:
+            _atomic_write(hash_path, lambda fh: fh.write(corpus_hash.encode()))
+        logger.info("Saved local index (%d vectors) to '%s'.", len(self), directory)
+
+    @classmethod
+    def load(cls, directory: str, embedding: Embeddings) -> "LocalVectorStore":
+        """
+        Load a store previously written by save().
+
+        The vector matrix is memory-mapped read-only rather than copied into
+        the heap.
+
+        Args:
+            directory: Folder containing the persisted index.
+            embedding: Embedding model used to embed incoming queries.
+
+        Returns:
+            LocalVectorStore with the persisted vectors and documents.
+        """
+        vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+        scale_path = os.path.join(directory, SCALE_FILE)
+        scale = np.load(scale_path) if os.path.exists(scale_path) else None
+        with open(os.path.join(directory, DOCUMENTS_FILE), "rb") as fh:
+            documents = pickle.load(fh)
+        logger.info("Loaded local index (%d vectors) from '%s'.", len(documents), directory)
+        return cls(embedding, vectors=vectors, documents=documents, scale=scale)
+
+
+def _read_corpus_hash(index_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(index_dir, CORPUS_HASH_FILE)) as fh:
+            return fh.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _index_fingerprint(corpus_hash: str, embedding_model_name: str, quantize: bool) -> str:
+    """Combine a corpus fingerprint with the settings its vectors depend on."""
+    settings = f"{corpus_hash}\0{embedding_model_name}\0{resolve_backend()}\0{int(quantize)}"
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+
+def create_local_store(
+    chunks: List[Document],
+    index_dir: str,
+    embedding_model_name: str = DEFAULT_EMBEDDING_MODEL,
+    quantize: bool = True,
+    corpus_hash: str | None = None,
+) -> LocalVectorStore:
+    """
+    Embed document chunks into a LocalVectorStore and persist it.
+
+    Args:
+        chunks:               List of document chunks to embed and store.
+        index_dir:            Folder the local index is written to.
+        embedding_model_name: HuggingFace model for embeddings.
+        quantize:             Store the vectors as int8 codes (4x smaller on
+                              disk and in memory, slightly lossy ranking).
+        corpus_hash:          Fingerprint of the source PDFs, recorded next
+                              to the index together with the embedding model,
+                              embedding backend and quantize setting, so
+                              unchanged corpora can skip ingestion on the next
+                              start-up.
+
+    Returns:
+        LocalVectorStore populated with the given chunks.
+    """
+    # Chunks just upserted to Pinecone are served from the embedding cache.
+    embeddings = get_cached_embeddings(get_embeddings(embedding_model_name), embedding_model_name)
+    store = LocalVectorStore.from_documents(chunks, embeddings, quantize=quantize)
+    if corpus_hash:
+        corpus_hash = _index_fingerprint(corpus_hash, embedding_model_name, quantize)
+    store.save(index_dir, corpus_hash=corpus_hash)
+    return store
+
+
+def load_local_store(
+    index_dir: str,
+    embedding_model_name: str = DEFAULT_EMBEDDING_MODEL,
+    corpus_hash: str | None = None,
+    quantize: bool = True,
+) -> Optional[LocalVectorStore]:
+    """
+    Load the persisted local index, if one exists.
+
+    Args:
+        index_dir:            Folder the local index was written to.
+        embedding_model_name: HuggingFace model for embeddings.
+        corpus_hash:          When given, only load an index built from a
+                              corpus with this fingerprint, with the same
+                              embedding model, embedding backend and
+                              quantize setting.
+        quantize:             Quantize setting the index must have been
+                              built with; only checked with corpus_hash.
+
+    Returns:
+        LocalVectorStore, or None when no index has been written yet or it
+        was built from a different corpus or with different settings.
+    """
+    if not os.path.exists(os.path.join(index_dir, VECTORS_FILE)):
+        logger.info("No local index found in '%s'.", index_dir)
+        return None
+    if corpus_hash is not None and _read_corpus_hash(index_dir) != _index_fingerprint(
+        corpus_hash, embedding_model_name, quantize
+    ):
+        logger.info("Local index in '%s' is stale for the current corpus or settings.", index_dir)
+        return None
+    embeddings = get_embeddings(embedding_model_name)
+    return LocalVectorStore.load(index_dir, embeddings)
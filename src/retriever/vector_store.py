@@ -1,19 +1,39 @@
 """
 Pinecone vector store creation and retrieval utilities.
 """
+import functools
 import logging
-from typing import List
+import uuid
+from typing import Iterator, List
 
 from langchain_core.documents import Document
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone, ServerlessSpec
 
-from src.embeddings.embedding_model import get_embeddings
+from src.embeddings.cache import get_cached_embeddings
+from src.embeddings.embedding_model import EMBEDDING_BATCH_SIZE, get_embeddings
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _get_client(pinecone_api_key: str) -> Pinecone:
+    """
+    Return the process-wide Pinecone client for an API key.
+
+    Reusing one client keeps its HTTP connection pool (and TLS sessions)
+    alive across create_vector_store / load_vector_store calls.
+    """
+    return Pinecone(api_key=pinecone_api_key)
+
+
+def _batched(items: List[Document], size: int) -> Iterator[List[Document]]:
+    """Yield consecutive slices of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 def _ensure_index_exists(
     pc: Pinecone,
     index_name: str,
@@ -52,29 +72,50 @@ def create_vector_store(
     index_name: str,
     pinecone_api_key: str,
     embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    upsert_threads: int = 4,
 ) -> PineconeVectorStore:
     """
     Embed document chunks and upsert them into a Pinecone vector store.
 
+    Chunks are embedded and upserted ``batch_size`` at a time so the
+    embedding model always sees full batches, and upserts are issued
+    asynchronously so network round-trips overlap with embedding.
+
     Args:
         chunks:               List of document chunks to embed and store.
         index_name:           Name of the Pinecone index.
         pinecone_api_key:     Pinecone API key.
         embedding_model_name: HuggingFace model for embeddings.
+        batch_size:           Chunks embedded and upserted per request.
+        upsert_threads:       Pinecone client threads serving concurrent upserts.
 
     Returns:
         PineconeVectorStore instance populated with the given chunks.
     """
-    pc = Pinecone(api_key=pinecone_api_key)
+    pc = _get_client(pinecone_api_key)
     _ensure_index_exists(pc, index_name)
 
-    embeddings = get_embeddings(embedding_model_name)
+    # Unchanged chunks reuse their cached vectors instead of re-running the model.
+    embeddings = get_cached_embeddings(get_embeddings(embedding_model_name), embedding_model_name)
+    index = pc.Index(index_name, pool_threads=upsert_threads)
+    vector_store = PineconeVectorStore(index=index, embedding=embeddings)
+
+    # Upserts run on the client's thread pool while the next batch is being
+    # embedded; results are only awaited once every batch has been sent.
+    pending = []
+    for batch in _batched(chunks, batch_size):
+        texts = [chunk.page_content for chunk in batch]
+        vectors = embeddings.embed_documents(texts)
+        # PineconeVectorStore reads the page content back from the "text" key.
+        metadatas = [{**chunk.metadata, "text": text} for chunk, text in zip(batch, texts)]
+        ids = [str(uuid.uuid4()) for _ in batch]
+        pending.append(
+            index.upsert(vectors=list(zip(ids, vectors, metadatas)), async_req=True)
+        )
+    for result in pending:
+        result.get()
 
-    vector_store = PineconeVectorStore.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        index_name=index_name,
-    )
     logger.info("Upserted %d chunks into index '%s'.", len(chunks), index_name)
     return vector_store
 
@@ -95,8 +136,7 @@ def load_vector_store(
     Returns:
         PineconeVectorStore instance wrapping the existing index.
     """
-    # Initialise client just to validate the key is usable (optional guard)
-    Pinecone(api_key=pinecone_api_key)
+    pc = _get_client(pinecone_api_key)
     embeddings = get_embeddings(embedding_model_name)
     logger.info("Loading existing vector store from index '%s'.", index_name)
-    return PineconeVectorStore(index_name=index_name, embedding=embeddings)
\ No newline at end of file
+    return PineconeVectorStore(index=pc.Index(index_name), embedding=embeddings)
\ No newline at end of file
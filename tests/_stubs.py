@@ -0,0 +1,64 @@
+"""
+Plain-Python test doubles shared across test modules.
+
+Lighter than MagicMock where a test only needs to record calls and return
+canned answers.
+"""
+from langchain_core.embeddings import Embeddings
+
+VOCAB = ["python", "django", "pandas", "numpy", "java"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Bag-of-keywords embedding so nearest neighbours are predictable."""
+
+    def _embed(self, text):
+        words = text.lower().replace(",", " ").replace(".", " ").split()
+        return [float(words.count(term)) for term in VOCAB]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class StubChain:
+    """
+    Chain double returning canned answers in order.
+
+    Once the answers run out, the last one is repeated. Every payload passed
+    to invoke() or abatch() is recorded in ``calls``. Like FastRAG, a
+    ``{"input": query}`` payload gets a dict with the answer under "answer".
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def invoke(self, payload):
+        self.calls.append(payload)
+        answer = self.responses[min(len(self.calls), len(self.responses)) - 1]
+        if isinstance(payload, dict):
+            return {"input": payload["input"], "context": [], "answer": answer}
+        return answer
+
+    async def abatch(self, queries, config=None):
+        self.config = config
+        return [self.invoke(query) for query in queries]
+
+
+class StubBuild:
+    """Stand-in for build_rag_chain that records calls and returns one chain."""
+
+    def __init__(self, return_value):
+        self.return_value = return_value
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+    @property
+    def call_count(self):
+        return len(self.calls)
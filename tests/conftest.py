@@ -3,17 +3,48 @@ Shared pytest fixtures used across all test modules.
 """
 import os
 import tempfile
+import zlib
 
+import numpy as np
 import pytest
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from unittest.mock import MagicMock, patch
 
 
+# ---------------------------------------------------------------------------
+# Module-level caches
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _clear_caches(tmp_path, monkeypatch):
+    """Start every test with empty process-wide and on-disk caches."""
+    from src.embeddings.cache import close_cached_embeddings
+    from src.embeddings.embedding_model import _load_embeddings
+    from src.rag import clear_chain_cache
+    from src.rag.llm import _build_llm
+    from src.retriever.vector_store import _get_client
+    monkeypatch.setenv("EMBED_CACHE_PATH", str(tmp_path / "embed_cache.sqlite"))
+    caches = (_load_embeddings, _build_llm, _get_client)
+    clear_chain_cache()
+    close_cached_embeddings()
+    for cache in caches:
+        cache.cache_clear()
+    yield
+    clear_chain_cache()
+    close_cached_embeddings()
+    for cache in caches:
+        cache.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # Document / chunk fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+# Built once per run: nothing under test mutates these documents, so every
+# test can share them.
+
+@pytest.fixture(scope="session")
 def sample_documents():
     """Two minimal Document objects mimicking loaded PDF pages."""
     return [
@@ -28,7 +59,7 @@ def sample_documents():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_chunks(sample_documents):
     """Pre-split chunks derived from sample_documents."""
     from src.loaders import split_docs
@@ -63,26 +94,123 @@ def empty_dir(tmp_path):
 
 
 # ---------------------------------------------------------------------------
-# Mock LLM fixture
+# Mock LLM / vector store fixtures
 # ---------------------------------------------------------------------------
+# Built once per test class and reset before every test, so call history
+# and per-test return values never leak between tests.
 
-@pytest.fixture
+def _configure_llm(llm):
+    llm.invoke.return_value = MagicMock(content="Mocked LLM answer.")
+
+
+def _configure_vector_store(store, documents):
+    retriever = MagicMock()
+    retriever.invoke.return_value = documents
+    store.as_retriever.return_value = retriever
+
+
+@pytest.fixture(scope="class")
 def mock_llm():
     """A MagicMock that quacks like a LangChain chat LLM."""
     llm = MagicMock()
-    llm.invoke.return_value = MagicMock(content="Mocked LLM answer.")
+    _configure_llm(llm)
     return llm
 
 
-# ---------------------------------------------------------------------------
-# Mock vector store fixture
-# ---------------------------------------------------------------------------
-
-@pytest.fixture
+@pytest.fixture(scope="class")
 def mock_vector_store(sample_documents):
     """A MagicMock PineconeVectorStore with a working retriever."""
     store = MagicMock()
-    retriever = MagicMock()
-    retriever.invoke.return_value = sample_documents
-    store.as_retriever.return_value = retriever
-    return store
\ No newline at end of file
+    _configure_vector_store(store, sample_documents)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(request, sample_documents):
+    """Restore the shared mocks to their freshly configured state."""
+    if "mock_llm" in request.fixturenames:
+        llm = request.getfixturevalue("mock_llm")
+        llm.reset_mock(return_value=True, side_effect=True)
+        _configure_llm(llm)
+    if "mock_vector_store" in request.fixturenames:
+        store = request.getfixturevalue("mock_vector_store")
+        store.reset_mock(return_value=True, side_effect=True)
+        _configure_vector_store(store, sample_documents)
+
+
+# ---------------------------------------------------------------------------
+# Seeded embeddings + exact ground truth (for recall tests)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def seeded_embeddings():
+    """A fixed 1000x384 float32 matrix, identical on every run."""
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((1000, 384), dtype=np.float32)
+
+
+@pytest.fixture(scope="session")
+def expected_top_k(seeded_embeddings):
+    """
+    Exact cosine top-k for a row of seeded_embeddings used as the query.
+
+    Returns a function ``expected_top_k(query_idx, k=10)`` giving row indices,
+    best first, for comparing approximate retrievers against.
+    """
+    unit = seeded_embeddings / np.linalg.norm(seeded_embeddings, axis=1, keepdims=True)
+
+    def top_k(query_idx, k=10):
+        return np.argsort(-(unit @ unit[query_idx]))[:k]
+
+    return top_k
+
+
+# ---------------------------------------------------------------------------
+# FAISS fixture (opt-in, for benchmark-marked tests)
+# ---------------------------------------------------------------------------
+
+FAISS_DIM = 384
+FAISS_SIZE = 1000
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic pseudo-random vectors per text, FAISS_DIM wide."""
+
+    def _embed(self, text):
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(FAISS_DIM).astype(np.float32).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+@pytest.fixture(scope="session")
+def faiss_vector_store():
+    """
+    A LangChain FAISS store over a trained 1000x384 IndexIVFFlat.
+
+    Unlike mock_vector_store this runs a real ANN search, so tests see actual
+    index cost. Skipped when faiss is not installed.
+    """
+    faiss = pytest.importorskip("faiss")
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    embeddings = HashEmbeddings()
+    texts = [f"resume chunk {i}" for i in range(FAISS_SIZE)]
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+    quantizer = faiss.IndexFlatL2(FAISS_DIM)
+    index = faiss.IndexIVFFlat(quantizer, FAISS_DIM, 32)
+    index.train(vectors)
+    index.add(vectors)
+    index.nprobe = 8
+
+    ids = [str(i) for i in range(FAISS_SIZE)]
+    docstore = InMemoryDocstore(
+        {doc_id: Document(page_content=text) for doc_id, text in zip(ids, texts)}
+    )
+    return FAISS(embeddings, index, docstore, dict(enumerate(ids)))
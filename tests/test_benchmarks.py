@@ -0,0 +1,69 @@
+"""
+Opt-in micro-benchmarks against a real FAISS IVF index.
+
+Deselected by default; run with ``pytest -m benchmark`` (needs faiss).
+"""
+import time
+
+import pytest
+
+from src.rag.chain import build_rag_chain, get_chain
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestFaissRetrieval:
+    def test_similarity_search_returns_k_documents(self, faiss_vector_store):
+        """An IVF search should return exactly k chunks."""
+        docs = faiss_vector_store.similarity_search("resume chunk 42", k=5)
+        assert len(docs) == 5
+
+    def test_exact_text_is_its_own_nearest_neighbour(self, faiss_vector_store):
+        """With nprobe=8 a stored chunk should be found for its own text."""
+        docs = faiss_vector_store.similarity_search("resume chunk 42", k=1)
+        assert docs[0].page_content == "resume chunk 42"
+
+    def test_each_cached_chain_searches_with_its_own_nprobe(
+        self, faiss_vector_store, mock_llm, monkeypatch
+    ):
+        """Alternating nprobe through get_chain must not leak between chains."""
+        import faiss
+
+        ivf = faiss.extract_index_ivf(faiss_vector_store.index)
+        seen = []
+        search = faiss_vector_store.similarity_search
+
+        def spy(query, **kwargs):
+            seen.append(ivf.nprobe)
+            return search(query, **kwargs)
+
+        monkeypatch.setattr(faiss_vector_store, "similarity_search", spy)
+        for nprobe in (1, 32, 1):
+            get_chain(faiss_vector_store, mock_llm, ann_params={"nprobe": nprobe}).invoke("q")
+        get_chain(faiss_vector_store, mock_llm).invoke("q")
+
+        assert seen == [1, 32, 1, 8]
+        assert ivf.nprobe == 8
+
+    def test_nprobe_changes_ivf_results(self, faiss_vector_store, mock_llm):
+        """Visiting 1 of 32 partitions should miss neighbours that visiting all 32 finds."""
+        queries = [f"unseen query {i}" for i in range(20)]
+
+        def results(nprobe):
+            chain = build_rag_chain(faiss_vector_store, mock_llm, k=5, ann_params={"nprobe": nprobe})
+            return [
+                [doc.page_content for doc in chain.invoke({"input": q})["context"]]
+                for q in queries
+            ]
+
+        assert results(1) != results(32)
+
+    def test_search_latency(self, faiss_vector_store):
+        """Mean per-query search time over 200 queries should stay under 50 ms."""
+        queries = [f"resume chunk {i}" for i in range(200)]
+        start = time.perf_counter()
+        for query in queries:
+            faiss_vector_store.similarity_search(query, k=5)
+        per_query = (time.perf_counter() - start) / len(queries)
+
+        assert per_query < 0.05, f"FAISS IVF search: {per_query * 1e6:.0f} us/query"
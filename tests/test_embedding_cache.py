@@ -0,0 +1,152 @@
+"""
+Tests for src/embeddings/cache.py
+Covers: CachedEmbeddings, get_cached_embeddings, close_cached_embeddings
+"""
+import pickle
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.embeddings import CachedEmbeddings, close_cached_embeddings, get_cached_embeddings
+from src.embeddings.cache import _content_hash
+
+
+@pytest.fixture
+def inner():
+    """Underlying model returning one distinct vector per text."""
+    model = MagicMock()
+    model.embed_documents.side_effect = lambda texts: [
+        [float(len(t)), 1.0, 0.5] for t in texts
+    ]
+    model.embed_query.return_value = [0.0, 1.0, 0.0]
+    return model
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+class TestCachedEmbeddings:
+    def test_first_call_embeds_everything(self, inner, cache_path):
+        """With an empty cache every text goes to the model."""
+        cached = CachedEmbeddings(inner, "model", path=cache_path)
+        vectors = cached.embed_documents(["ab", "abcd"])
+
+        inner.embed_documents.assert_called_once_with(["ab", "abcd"])
+        assert vectors == [[2.0, 1.0, 0.5], [4.0, 1.0, 0.5]]
+
+    def test_repeat_call_hits_cache(self, inner, cache_path):
+        """Texts seen before must not reach the model again."""
+        cached = CachedEmbeddings(inner, "model", path=cache_path)
+        first = cached.embed_documents(["ab", "abcd"])
+        second = cached.embed_documents(["ab", "abcd"])
+
+        assert inner.embed_documents.call_count == 1
+        assert second == first
+
+    def test_only_misses_are_embedded_and_order_is_kept(self, inner, cache_path):
+        """Mixed hits and misses should come back in input order."""
+        cached = CachedEmbeddings(inner, "model", path=cache_path)
+        cached.embed_documents(["ab"])
+        vectors = cached.embed_documents(["abc", "ab", "abcde"])
+
+        inner.embed_documents.assert_called_with(["abc", "abcde"])
+        assert [v[0] for v in vectors] == [3.0, 2.0, 5.0]
+
+    def test_cache_persists_across_instances(self, inner, cache_path):
+        """A new instance on the same file should reuse stored vectors."""
+        CachedEmbeddings(inner, "model", path=cache_path).embed_documents(["ab"])
+        CachedEmbeddings(inner, "model", path=cache_path).embed_documents(["ab"])
+        assert inner.embed_documents.call_count == 1
+
+    def test_models_do_not_share_entries(self, inner, cache_path):
+        """Vectors cached for one model must not be returned for another."""
+        CachedEmbeddings(inner, "model-a", path=cache_path).embed_documents(["ab"])
+        CachedEmbeddings(inner, "model-b", path=cache_path).embed_documents(["ab"])
+        assert inner.embed_documents.call_count == 2
+
+    def test_backends_do_not_share_entries(self, inner, cache_path):
+        """Vectors from the int8 ONNX backend must not be served to the torch backend."""
+        CachedEmbeddings(inner, "model", path=cache_path, backend="onnx-int8").embed_documents(["ab"])
+        CachedEmbeddings(inner, "model", path=cache_path, backend="torch").embed_documents(["ab"])
+        assert inner.embed_documents.call_count == 2
+
+    def test_backend_defaults_to_env(self, inner, cache_path, monkeypatch):
+        """Without an explicit backend, EMBED_BACKEND selects the namespace."""
+        monkeypatch.setenv("EMBED_BACKEND", "onnx-int8")
+        CachedEmbeddings(inner, "model", path=cache_path).embed_documents(["ab"])
+        CachedEmbeddings(inner, "model", path=cache_path, backend="onnx-int8").embed_documents(["ab"])
+        assert inner.embed_documents.call_count == 1
+
+    def test_miss_returns_same_vector_as_later_hit(self, cache_path):
+        """A text's vector must not depend on whether it was already cached."""
+        model = MagicMock()
+        model.embed_documents.side_effect = lambda texts: [[0.1, 1 / 3, 0.7] for _ in texts]
+        cached = CachedEmbeddings(model, "model", path=cache_path)
+
+        miss = cached.embed_documents(["ab"])
+        hit = cached.embed_documents(["ab"])
+
+        assert model.embed_documents.call_count == 1
+        assert miss == hit
+
+    def test_close_releases_connection(self, inner, cache_path):
+        """After close() the SQLite connection can no longer be used."""
+        cached = CachedEmbeddings(inner, "model", path=cache_path)
+        cached.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            cached.embed_documents(["ab"])
+
+    def test_embed_query_is_passed_through(self, inner, cache_path):
+        """Queries are not cached here and go straight to the model."""
+        cached = CachedEmbeddings(inner, "model", path=cache_path)
+        assert cached.embed_query("python") == [0.0, 1.0, 0.0]
+        inner.embed_query.assert_called_once_with("python")
+
+
+class TestSharedCachedEmbeddings:
+    def test_same_model_shares_one_instance(self, inner):
+        """Repeated ingests should reuse one wrapper and its connection."""
+        assert get_cached_embeddings(inner, "model") is get_cached_embeddings(inner, "model")
+
+    def test_backends_get_separate_instances(self, inner):
+        """Each backend keeps its own namespace, so its own wrapper."""
+        torch = get_cached_embeddings(inner, "model", backend="torch")
+        onnx = get_cached_embeddings(inner, "model", backend="onnx-int8")
+        assert torch is not onnx
+
+    def test_close_closes_and_forgets_shared_instances(self, inner):
+        """close_cached_embeddings should close open wrappers and hand out fresh ones."""
+        first = get_cached_embeddings(inner, "model")
+        close_cached_embeddings()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.embed_documents(["ab"])
+        second = get_cached_embeddings(inner, "model")
+        assert second is not first
+        assert second.embed_documents(["ab"]) == [[2.0, 1.0, 0.5]]
+
+
+class LengthEmbeddings:
+    """Picklable stand-in model: one vector per text, derived from its length."""
+
+    def embed_documents(self, texts):
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    def embed_query(self, text):
+        return [0.0, 1.0, 0.0]
+
+
+class TestCachedEmbeddingsPickling:
+    def test_round_trip_reopens_cache(self, cache_path):
+        """An unpickled wrapper should reconnect to the same cache file."""
+        cached = CachedEmbeddings(LengthEmbeddings(), "model", path=cache_path)
+        cached.embed_documents(["ab"])
+
+        restored = pickle.loads(pickle.dumps(cached))
+
+        assert restored.path == cache_path
+        assert restored._lookup([_content_hash("ab")])
+        assert restored.embed_documents(["ab", "abc"]) == [[2.0, 1.0, 0.5], [3.0, 1.0, 0.5]]
@@ -7,7 +7,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.embeddings import get_embeddings
-from src.embeddings.embedding_model import DEFAULT_EMBEDDING_MODEL, EMBEDDING_DIMENSION
+from src.embeddings.embedding_model import (
+    DEFAULT_EMBEDDING_MODEL,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSION,
+)
 
 
 class TestGetEmbeddings:
@@ -32,7 +36,8 @@ class TestGetEmbeddings:
         ) as MockEmbeddings:
             MockEmbeddings.return_value = MagicMock()
             get_embeddings()
-            MockEmbeddings.assert_called_once_with(model_name=DEFAULT_EMBEDDING_MODEL)
+            MockEmbeddings.assert_called_once()
+            assert MockEmbeddings.call_args.kwargs["model_name"] == DEFAULT_EMBEDDING_MODEL
 
     def test_accepts_custom_model_name(self):
         """Passing a custom model name should forward it to HuggingFaceEmbeddings."""
@@ -42,7 +47,21 @@ class TestGetEmbeddings:
         ) as MockEmbeddings:
             MockEmbeddings.return_value = MagicMock()
             get_embeddings(model_name=custom_model)
-            MockEmbeddings.assert_called_once_with(model_name=custom_model)
+            MockEmbeddings.assert_called_once()
+            assert MockEmbeddings.call_args.kwargs["model_name"] == custom_model
+
+    def test_encodes_in_normalised_batches(self):
+        """Embeddings should be batched and L2-normalised for inner-product search."""
+        with patch(
+            "src.embeddings.embedding_model.HuggingFaceEmbeddings"
+        ) as MockEmbeddings:
+            MockEmbeddings.return_value = MagicMock()
+            get_embeddings()
+            encode_kwargs = MockEmbeddings.call_args.kwargs["encode_kwargs"]
+        assert encode_kwargs == {
+            "batch_size": EMBEDDING_BATCH_SIZE,
+            "normalize_embeddings": True,
+        }
 
     def test_default_model_constant_is_correct(self):
         """Sanity-check the default model constant value."""
@@ -52,12 +71,67 @@ class TestGetEmbeddings:
         """Sanity-check the dimension constant for the default model."""
         assert EMBEDDING_DIMENSION == 384
 
-    def test_get_embeddings_called_once_per_invocation(self):
-        """Each call to get_embeddings should instantiate the model exactly once."""
+    def test_get_embeddings_loads_model_once(self):
+        """Repeated calls with the same model name should share one instance."""
         with patch(
             "src.embeddings.embedding_model.HuggingFaceEmbeddings"
         ) as MockEmbeddings:
             MockEmbeddings.return_value = MagicMock()
-            get_embeddings()
-            get_embeddings()
-        assert MockEmbeddings.call_count == 2
\ No newline at end of file
+            first = get_embeddings()
+            second = get_embeddings()
+        assert MockEmbeddings.call_count == 1
+        assert first is second
+
+    def test_different_models_are_loaded_separately(self):
+        """Each distinct model name should get its own instance."""
+        with patch(
+            "src.embeddings.embedding_model.HuggingFaceEmbeddings"
+        ) as MockEmbeddings:
+            MockEmbeddings.side_effect = lambda **kwargs: MagicMock()
+            first = get_embeddings("model-a")
+            second = get_embeddings("model-b")
+        assert MockEmbeddings.call_count == 2
+        assert first is not second
+
+    def test_onnx_backend_selected_by_env(self, monkeypatch):
+        """EMBED_BACKEND=onnx-int8 should route to the quantised ONNX model."""
+        monkeypatch.setenv("EMBED_BACKEND", "onnx-int8")
+        with patch(
+            "src.embeddings.onnx_minilm.OnnxInt8Embeddings"
+        ) as MockOnnx, patch(
+            "src.embeddings.embedding_model.HuggingFaceEmbeddings"
+        ) as MockEmbeddings:
+            result = get_embeddings()
+
+        assert result is MockOnnx.return_value
+        assert MockOnnx.call_args.args[0] == DEFAULT_EMBEDDING_MODEL
+        MockEmbeddings.assert_not_called()
+
+    def test_unknown_backend_raises(self):
+        """An unrecognised backend name should fail loudly."""
+        with pytest.raises(ValueError, match="Unknown embedding backend"):
+            get_embeddings(backend="tensorrt")
+
+    def test_concurrent_first_calls_load_model_once(self):
+        """Threads racing on the first call should share one loaded model."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        started = threading.Event()
+
+        def slow_load(**kwargs):
+            started.set()
+            time.sleep(0.05)
+            return MagicMock()
+
+        with patch(
+            "src.embeddings.embedding_model.HuggingFaceEmbeddings"
+        ) as MockEmbeddings:
+            MockEmbeddings.side_effect = slow_load
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                first = pool.submit(get_embeddings)
+                started.wait()
+                second = get_embeddings()
+            assert first.result() is second
+        assert MockEmbeddings.call_count == 1
@@ -0,0 +1,52 @@
+"""
+Tests for src/rag/llm.py
+Covers: get_llm
+"""
+from unittest.mock import patch
+
+import pytest
+
+from src.rag.llm import get_llm
+
+
+@pytest.fixture
+def mock_hf():
+    with patch("src.rag.llm.HuggingFaceEndpoint") as MockEndpoint, patch(
+        "src.rag.llm.ChatHuggingFace"
+    ) as MockChat:
+        yield MockEndpoint, MockChat
+
+
+class TestGetLlm:
+    def test_wraps_endpoint_in_chat_model_by_default(self, mock_hf, monkeypatch):
+        """Without CHAT_STYLE the endpoint should be wrapped in ChatHuggingFace."""
+        MockEndpoint, MockChat = mock_hf
+        monkeypatch.delenv("CHAT_STYLE", raising=False)
+
+        llm = get_llm(hf_token="token")
+
+        MockChat.assert_called_once_with(llm=MockEndpoint.return_value)
+        assert llm is MockChat.return_value
+
+    def test_chat_style_off_returns_raw_endpoint(self, mock_hf, monkeypatch):
+        """CHAT_STYLE=off should hand back the bare text-generation endpoint."""
+        MockEndpoint, MockChat = mock_hf
+        monkeypatch.setenv("CHAT_STYLE", "off")
+
+        llm = get_llm(hf_token="token")
+
+        MockChat.assert_not_called()
+        assert llm is MockEndpoint.return_value
+
+    def test_reuses_client_for_same_configuration(self, mock_hf):
+        """Repeated calls with the same settings should share one endpoint."""
+        MockEndpoint, _ = mock_hf
+
+        assert get_llm(hf_token="token") is get_llm(hf_token="token")
+        MockEndpoint.assert_called_once()
+
+    def test_missing_token_raises(self, monkeypatch):
+        """Without any token get_llm should fail fast."""
+        monkeypatch.delenv("HUGGINGFACEHUB_API_TOKEN", raising=False)
+        with pytest.raises(ValueError):
+            get_llm()
@@ -3,12 +3,21 @@ Tests for src/loaders/document_loader.py
 Covers: load_docs, split_docs
 """
 import os
+import shutil
 from unittest.mock import MagicMock, patch
 
 import pytest
 from langchain_core.documents import Document
 
-from src.loaders import load_docs, split_docs
+from src.loaders import (
+    FitzPDFLoader,
+    corpus_hash,
+    fast_split,
+    load_docs,
+    load_docs_parallel,
+    split_docs,
+)
+from src.loaders.document_loader import _pdf_loader_cls
 
 
 # ---------------------------------------------------------------------------
@@ -103,4 +112,190 @@ class TestSplitDocs:
         """Calling split_docs with only documents should still work."""
         chunks = split_docs(sample_documents)
         assert isinstance(chunks, list)
-        assert len(chunks) > 0
\ No newline at end of file
+        assert len(chunks) > 0
+
+
+# ---------------------------------------------------------------------------
+# fast_split
+# ---------------------------------------------------------------------------
+
+class TestFastSplit:
+    def test_chunk_size_is_respected(self, sample_documents):
+        """No chunk's content should exceed the configured chunk_size."""
+        for chunk_size in (20, 30, 50):
+            chunks = fast_split(sample_documents, chunk_size=chunk_size, chunk_overlap=5)
+            assert chunks
+            assert all(len(c.page_content) <= chunk_size for c in chunks)
+
+    def test_every_word_is_kept(self, sample_documents):
+        """Splitting must not drop any text from the source documents."""
+        chunks = fast_split(sample_documents, chunk_size=30, chunk_overlap=5)
+        chunk_words = {w for c in chunks for w in c.page_content.split()}
+        for doc in sample_documents:
+            assert set(doc.page_content.split()) <= chunk_words
+
+    def test_prefers_sentence_boundaries(self):
+        """Chunks should end at sentence ends when one fits in the window."""
+        doc = Document(
+            page_content="Alice writes Python daily. Bob prefers Java and Kotlin.",
+            metadata={"source": "x.pdf"},
+        )
+        chunks = fast_split([doc], chunk_size=40, chunk_overlap=0)
+        assert chunks[0].page_content == "Alice writes Python daily."
+
+    def test_metadata_is_preserved(self, sample_documents):
+        """Every chunk should carry its source document's metadata."""
+        chunks = fast_split(sample_documents, chunk_size=20, chunk_overlap=0)
+        assert {c.metadata["source"] for c in chunks} == {
+            "alice_resume.pdf",
+            "bob_resume.pdf",
+        }
+
+    def test_empty_input_returns_empty_list(self):
+        """Passing an empty list should return an empty list."""
+        assert fast_split([]) == []
+
+    def test_split_docs_uses_fast_backend_from_env(self, sample_documents, monkeypatch):
+        """SPLITTER_BACKEND=fast should route split_docs to fast_split."""
+        monkeypatch.setenv("SPLITTER_BACKEND", "fast")
+        with patch("src.loaders.document_loader.fast_split", return_value=[]) as mock_fast:
+            split_docs(sample_documents, chunk_size=40, chunk_overlap=4)
+        mock_fast.assert_called_once_with(sample_documents, chunk_size=40, chunk_overlap=4)
+
+
+# ---------------------------------------------------------------------------
+# load_docs_parallel
+# ---------------------------------------------------------------------------
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(__file__), "..", "resumes", "John_Doe.pdf")
+
+
+class TestLoadDocsParallel:
+    def test_creates_directory_if_missing(self, tmp_path):
+        """load_docs_parallel should create the directory when it does not exist."""
+        target = str(tmp_path / "new_dir")
+        load_docs_parallel(target)
+        assert os.path.exists(target)
+
+    def test_returns_empty_list_for_empty_dir(self, empty_dir):
+        """An empty directory should yield zero documents."""
+        assert load_docs_parallel(empty_dir) == []
+
+    def test_loads_each_pdf_through_load_pdf(self, tmp_path):
+        """Every *.pdf in the directory should be parsed, in file-name order."""
+        for name in ("b.pdf", "a.pdf", "notes.txt"):
+            (tmp_path / name).write_bytes(b"")
+
+        def fake_load(path):
+            return [Document(page_content=os.path.basename(path), metadata={})]
+
+        with patch("src.loaders.document_loader._load_pdf", side_effect=fake_load):
+            docs = load_docs_parallel(str(tmp_path), workers=1)
+
+        assert [d.page_content for d in docs] == ["a.pdf", "b.pdf"]
+
+    def test_workers_are_not_forked(self, tmp_path):
+        """The pool must not fork a process that may be running other threads."""
+        for name in ("a.pdf", "b.pdf"):
+            (tmp_path / name).write_bytes(b"")
+
+        with patch("src.loaders.document_loader.ProcessPoolExecutor") as MockPool:
+            MockPool.return_value.__enter__.return_value.map.return_value = [[], []]
+            load_docs_parallel(str(tmp_path), workers=2)
+
+        assert MockPool.call_args.kwargs["mp_context"].get_start_method() != "fork"
+
+    def test_parallel_matches_serial(self, tmp_path):
+        """Parsing in worker processes should give the same pages as in-process."""
+        for name in ("alice.pdf", "bob.pdf", "carol.pdf"):
+            shutil.copy(SAMPLE_RESUME, tmp_path / name)
+
+        serial = load_docs_parallel(str(tmp_path), workers=1)
+        parallel = load_docs_parallel(str(tmp_path), workers=3)
+
+        assert [d.page_content for d in parallel] == [d.page_content for d in serial]
+        assert [d.metadata["source"] for d in parallel] == [
+            d.metadata["source"] for d in serial
+        ]
+
+
+# ---------------------------------------------------------------------------
+# corpus_hash
+# ---------------------------------------------------------------------------
+
+class TestCorpusHash:
+    def test_returns_none_without_pdfs(self, tmp_path):
+        """A folder with no PDFs has nothing to fingerprint."""
+        (tmp_path / "notes.txt").write_text("x")
+        assert corpus_hash(str(tmp_path)) is None
+        assert corpus_hash(str(tmp_path / "missing")) is None
+
+    def test_stable_for_unchanged_files(self, tmp_path):
+        """Hashing the same files twice should give the same digest."""
+        (tmp_path / "a.pdf").write_bytes(b"")
+        (tmp_path / "b.pdf").write_bytes(b"")
+        assert corpus_hash(str(tmp_path)) == corpus_hash(str(tmp_path))
+
+    def test_changes_when_file_added_or_touched(self, tmp_path):
+        """New or modified PDFs should change the digest."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"")
+        original = corpus_hash(str(tmp_path))
+
+        os.utime(pdf, ns=(0, os.stat(pdf).st_mtime_ns + 1))
+        touched = corpus_hash(str(tmp_path))
+        (tmp_path / "b.pdf").write_bytes(b"")
+
+        assert len({original, touched, corpus_hash(str(tmp_path))}) == 3
+
+    def test_changes_with_chunking_settings(self, tmp_path, monkeypatch):
+        """Splitter backend, loader backend and chunk parameters should change the digest."""
+        (tmp_path / "a.pdf").write_bytes(b"")
+        monkeypatch.setenv("LOADER_BACKEND", "pypdf")
+        default = corpus_hash(str(tmp_path))
+
+        digests = {
+            default,
+            corpus_hash(str(tmp_path), chunk_size=400),
+            corpus_hash(str(tmp_path), chunk_overlap=10),
+        }
+        monkeypatch.setenv("SPLITTER_BACKEND", "fast")
+        digests.add(corpus_hash(str(tmp_path)))
+        monkeypatch.setenv("LOADER_BACKEND", "pymupdf")
+        digests.add(corpus_hash(str(tmp_path)))
+
+        assert len(digests) == 5
+
+
+# ---------------------------------------------------------------------------
+# PDF loader backends
+# ---------------------------------------------------------------------------
+
+class TestPdfLoaderBackend:
+    def test_pypdf_backend_selected_by_env(self, monkeypatch):
+        """LOADER_BACKEND=pypdf should use LangChain's PyPDFLoader."""
+        from langchain_community.document_loaders import PyPDFLoader
+
+        monkeypatch.setenv("LOADER_BACKEND", "pypdf")
+        assert _pdf_loader_cls() is PyPDFLoader
+
+    def test_pymupdf_backend_selected_by_env(self, monkeypatch):
+        """LOADER_BACKEND=pymupdf should use FitzPDFLoader."""
+        monkeypatch.setenv("LOADER_BACKEND", "pymupdf")
+        assert _pdf_loader_cls() is FitzPDFLoader
+
+    def test_unknown_backend_raises(self, monkeypatch):
+        """An unrecognised backend name should fail loudly."""
+        monkeypatch.setenv("LOADER_BACKEND", "pdfminer")
+        with pytest.raises(ValueError, match="Unknown LOADER_BACKEND"):
+            _pdf_loader_cls()
+
+    def test_fitz_loader_returns_one_document_per_page(self):
+        """FitzPDFLoader should extract page text with source and page metadata."""
+        pytest.importorskip("pymupdf")
+        docs = FitzPDFLoader(SAMPLE_RESUME).load()
+
+        assert len(docs) >= 1
+        assert "John Doe" in docs[0].page_content
+        assert docs[0].metadata["source"] == SAMPLE_RESUME
+        assert [d.metadata["page"] for d in docs] == list(range(len(docs)))
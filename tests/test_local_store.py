@@ -0,0 +1,343 @@
+"""
+Tests for src/retriever/local_store.py
+Covers: LocalVectorStore, create_local_store, load_local_store
+"""
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.retriever import LocalVectorStore, create_local_store, load_local_store
+from tests._stubs import KeywordEmbeddings
+
+
+@pytest.fixture
+def local_store(sample_documents):
+    return LocalVectorStore.from_documents(sample_documents, KeywordEmbeddings())
+
+
+# ---------------------------------------------------------------------------
+# LocalVectorStore
+# ---------------------------------------------------------------------------
+
+class TestLocalVectorStore:
+    def test_stores_every_document(self, local_store, sample_documents):
+        """from_documents should index one vector per document."""
+        assert len(local_store) == len(sample_documents)
+
+    def test_returns_most_similar_document_first(self, local_store):
+        """The closest document by cosine similarity should rank first."""
+        results = local_store.similarity_search("django", k=1)
+        assert results[0].metadata["source"] == "alice_resume.pdf"
+
+    def test_respects_k(self, local_store):
+        """No more than k documents should be returned."""
+        assert len(local_store.similarity_search("python", k=1)) == 1
+
+    def test_empty_store_returns_no_documents(self):
+        """Searching an empty store should return an empty list."""
+        store = LocalVectorStore(KeywordEmbeddings())
+        assert store.similarity_search("python") == []
+
+    def test_as_retriever_uses_local_search(self, local_store):
+        """The LangChain retriever interface should work on the local store."""
+        retriever = local_store.as_retriever(search_kwargs={"k": 1})
+        docs = retriever.invoke("pandas and numpy")
+        assert docs[0].metadata["source"] == "bob_resume.pdf"
+
+    def test_save_and_load_round_trip(self, local_store, tmp_path):
+        """A saved store should load with identical documents and results."""
+        local_store.save(str(tmp_path))
+        loaded = LocalVectorStore.load(str(tmp_path), KeywordEmbeddings())
+
+        assert len(loaded) == len(local_store)
+        assert loaded.similarity_search("django", k=1) == local_store.similarity_search(
+            "django", k=1
+        )
+
+    def test_load_memory_maps_vectors(self, local_store, tmp_path):
+        """Loaded vectors should be backed by the file, not a heap copy."""
+        local_store.save(str(tmp_path))
+        loaded = LocalVectorStore.load(str(tmp_path), KeywordEmbeddings())
+
+        assert isinstance(loaded._vectors.base, np.memmap)
+
+    def test_save_over_loaded_index(self, local_store, tmp_path):
+        """Re-saving into the directory a store was mapped from should be safe."""
+        local_store.save(str(tmp_path))
+        loaded = LocalVectorStore.load(str(tmp_path), KeywordEmbeddings())
+        loaded.add_texts(["Carol writes Rust and Go."], metadatas=[{"source": "carol.pdf"}])
+        loaded.save(str(tmp_path))
+
+        reloaded = LocalVectorStore.load(str(tmp_path), KeywordEmbeddings())
+        assert len(reloaded) == len(local_store) + 1
+        assert loaded.similarity_search("django", k=1)[0].metadata["source"] == "alice_resume.pdf"
+
+
+class TestQueryEmbeddingCache:
+    def test_repeated_query_is_embedded_once(self, sample_documents):
+        """Asking the same question twice should embed it only once."""
+        embeddings = KeywordEmbeddings()
+        embeddings.embed_query = MagicMock(side_effect=embeddings._embed)
+        store = LocalVectorStore.from_documents(sample_documents, embeddings)
+
+        first = store.similarity_search("django", k=1)
+        second = store.similarity_search("  django ", k=1)
+
+        embeddings.embed_query.assert_called_once_with("django")
+        assert first == second
+
+    def test_least_recently_used_query_is_evicted(self, sample_documents):
+        """The cache should stay bounded, dropping the oldest query first."""
+        embeddings = KeywordEmbeddings()
+        embeddings.embed_query = MagicMock(side_effect=embeddings._embed)
+        store = LocalVectorStore.from_documents(sample_documents, embeddings)
+
+        with patch("src.retriever.local_store.QUERY_CACHE_SIZE", 2):
+            store.similarity_search("python")
+            store.similarity_search("django")
+            store.similarity_search("python")   # refresh "python"
+            store.similarity_search("pandas")   # evicts "django"
+            store.similarity_search("python")
+            store.similarity_search("django")
+
+        assert [c.args[0] for c in embeddings.embed_query.call_args_list] == [
+            "python",
+            "django",
+            "pandas",
+            "django",
+        ]
+
+
+class RandomEmbeddings(Embeddings):
+    """Fixed random vectors per text, for comparing float and int8 rankings."""
+
+    def __init__(self, texts, dim=64):
+        rng = np.random.default_rng(0)
+        self.table = {t: rng.standard_normal(dim).tolist() for t in texts}
+
+    def embed_documents(self, texts):
+        return [self.table[t] for t in texts]
+
+    def embed_query(self, text):
+        return self.table[text]
+
+
+class TestQuantizedLocalVectorStore:
+    @pytest.fixture
+    def texts(self):
+        return [f"resume {i}" for i in range(200)]
+
+    def test_vectors_are_stored_as_int8(self, texts):
+        """quantize=True should keep int8 codes rather than float32 vectors."""
+        store = LocalVectorStore.from_texts(texts, RandomEmbeddings(texts), quantize=True)
+        assert store._vectors.dtype == np.int8
+
+    def test_top_k_matches_float_store(self, texts):
+        """int8 codes should rank neighbours (almost) exactly like float32."""
+        embeddings = RandomEmbeddings(texts)
+        exact = LocalVectorStore.from_texts(texts, embeddings)
+        quantized = LocalVectorStore.from_texts(texts, embeddings, quantize=True)
+
+        overlap = []
+        for query in texts[:20]:
+            want = {d.page_content for d in exact.similarity_search(query, k=5)}
+            got = {d.page_content for d in quantized.similarity_search(query, k=5)}
+            overlap.append(len(want & got) / 5)
+            assert quantized.similarity_search(query, k=1)[0].page_content == query
+        assert np.mean(overlap) >= 0.95
+
+    def test_partial_top_k_matches_full_sort(self, texts):
+        """Partitioned top-k should return the same ordered hits as a full sort."""
+        embeddings = RandomEmbeddings(texts)
+        store = LocalVectorStore.from_texts(texts, embeddings)
+
+        for query in texts[:10]:
+            hits = store.similarity_search_with_score(query, k=10)
+            vector = np.asarray(embeddings.embed_query(query))
+            scores = store._vectors @ (vector / np.linalg.norm(vector))
+            expected = [texts[i] for i in np.argsort(-scores)[:10]]
+            assert [doc.page_content for doc, _ in hits] == expected
+            assert [score for _, score in hits] == sorted((s for _, s in hits), reverse=True)
+
+    def test_query_does_not_widen_whole_matrix(self):
+        """Scoring int8 codes must not allocate a float32 copy of the matrix."""
+        rows, dim = 50_000, 384
+        rng = np.random.default_rng(0)
+        codes = rng.integers(-127, 128, size=(rows, dim), dtype=np.int8)
+        scale = np.full(dim, 1 / 127, dtype=np.float32)
+        store = LocalVectorStore(
+            KeywordEmbeddings(),
+            vectors=codes,
+            documents=[Document(page_content=str(i)) for i in range(rows)],
+            scale=scale,
+        )
+        query = rng.standard_normal(dim).tolist()
+
+        tracemalloc.start()
+        try:
+            store.similarity_search_by_vector_with_score(query, k=5)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        float_copy = rows * dim * 4
+        assert peak < float_copy / 10, f"peak {peak / 1e6:.1f} MB per query"
+
+    def test_blocked_scores_match_dense_product(self, texts):
+        """Block-wise scoring should equal the dequantised matrix product."""
+        embeddings = RandomEmbeddings(texts)
+        store = LocalVectorStore.from_texts(texts, embeddings, quantize=True)
+        query = np.asarray(embeddings.embed_query(texts[0]), dtype=np.float32)
+        query /= np.linalg.norm(query)
+
+        with patch("src.retriever.local_store.SCORE_BLOCK_ROWS", 64):
+            hits = store.similarity_search_by_vector_with_score(query.tolist(), k=len(texts))
+        dense = store._float_vectors() @ query
+
+        got = {doc.page_content: score for doc, score in hits}
+        expected = {text: dense[i] for i, text in enumerate(texts)}
+        assert got == pytest.approx(expected, rel=1e-5, abs=1e-6)
+
+    def test_add_texts_requantizes(self, texts):
+        """Adding texts to a quantized store should keep earlier documents findable."""
+        embeddings = RandomEmbeddings(texts)
+        store = LocalVectorStore.from_texts(texts[:100], embeddings, quantize=True)
+        store.add_texts(texts[100:])
+
+        assert len(store) == len(texts)
+        assert store.similarity_search(texts[3], k=1)[0].page_content == texts[3]
+
+    def test_save_and_load_keeps_quantization(self, texts, tmp_path):
+        """A quantized store should load back quantized with identical results."""
+        embeddings = RandomEmbeddings(texts)
+        store = LocalVectorStore.from_texts(texts, embeddings, quantize=True)
+        store.save(str(tmp_path))
+        loaded = LocalVectorStore.load(str(tmp_path), embeddings)
+
+        assert loaded._vectors.dtype == np.int8
+        assert loaded.similarity_search(texts[7], k=5) == store.similarity_search(
+            texts[7], k=5
+        )
+
+
+class TestRecallAgainstExactTopK:
+    @pytest.fixture
+    def documents(self, seeded_embeddings):
+        return [
+            Document(page_content=f"chunk {i}", metadata={"row": i})
+            for i in range(len(seeded_embeddings))
+        ]
+
+    @pytest.fixture
+    def unit_vectors(self, seeded_embeddings):
+        # The constructor takes vectors as stored, i.e. already L2-normalised.
+        return seeded_embeddings / np.linalg.norm(seeded_embeddings, axis=1, keepdims=True)
+
+    def _recall(self, store, seeded_embeddings, expected_top_k, k=10, queries=50):
+        hits = 0
+        for i in range(queries):
+            found = store.similarity_search_by_vector(seeded_embeddings[i].tolist(), k=k)
+            hits += len({doc.metadata["row"] for doc in found} & set(expected_top_k(i, k)))
+        return hits / (k * queries)
+
+    def test_float_store_matches_exact_top_k(
+        self, seeded_embeddings, expected_top_k, documents, unit_vectors
+    ):
+        """The float32 store is exact: recall against ground truth must be 1."""
+        store = LocalVectorStore(KeywordEmbeddings(), vectors=unit_vectors, documents=documents)
+        assert self._recall(store, seeded_embeddings, expected_top_k) == 1.0
+
+    def test_quantized_store_recall(
+        self, seeded_embeddings, expected_top_k, documents, unit_vectors
+    ):
+        """int8 codes should keep recall@10 at or above 0.95."""
+        store = LocalVectorStore(
+            KeywordEmbeddings(), vectors=unit_vectors, documents=documents, quantize=True
+        )
+        assert self._recall(store, seeded_embeddings, expected_top_k) >= 0.95
+
+
+# ---------------------------------------------------------------------------
+# create_local_store / load_local_store
+# ---------------------------------------------------------------------------
+
+class TestLocalStoreFactories:
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_create_persists_index(self, mock_get_embeddings, sample_documents, tmp_path):
+        """create_local_store should write an index load_local_store can read."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+
+        create_local_store(sample_documents, str(tmp_path))
+        loaded = load_local_store(str(tmp_path))
+
+        assert isinstance(loaded, LocalVectorStore)
+        assert len(loaded) == len(sample_documents)
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_load_returns_none_when_missing(self, mock_get_embeddings, tmp_path):
+        """With no persisted index, callers should fall back to Pinecone."""
+        assert load_local_store(str(tmp_path / "missing")) is None
+        mock_get_embeddings.assert_not_called()
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_load_matches_corpus_hash(self, mock_get_embeddings, sample_documents, tmp_path):
+        """An index should only be reused for the corpus it was built from."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+        create_local_store(sample_documents, str(tmp_path), corpus_hash="abc")
+
+        assert load_local_store(str(tmp_path), corpus_hash="abc") is not None
+        assert load_local_store(str(tmp_path), corpus_hash="def") is None
+        assert load_local_store(str(tmp_path)) is not None
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_load_rejects_index_from_other_embedding_backend(
+        self, mock_get_embeddings, sample_documents, tmp_path, monkeypatch
+    ):
+        """Switching EMBED_BACKEND must not reuse vectors from the old backend."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+        monkeypatch.setenv("EMBED_BACKEND", "torch")
+        create_local_store(sample_documents, str(tmp_path), corpus_hash="abc")
+
+        monkeypatch.setenv("EMBED_BACKEND", "onnx-int8")
+        assert load_local_store(str(tmp_path), corpus_hash="abc") is None
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_load_rejects_index_with_other_model_or_quantization(
+        self, mock_get_embeddings, sample_documents, tmp_path
+    ):
+        """The embedding model and quantize setting are part of the fingerprint."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+        create_local_store(sample_documents, str(tmp_path), corpus_hash="abc")
+
+        assert load_local_store(str(tmp_path), "other-model", corpus_hash="abc") is None
+        assert load_local_store(str(tmp_path), corpus_hash="abc", quantize=False) is None
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_rebuild_without_hash_clears_stale_hash(
+        self, mock_get_embeddings, sample_documents, tmp_path
+    ):
+        """An index rebuilt without a fingerprint must not match the old one."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+        create_local_store(sample_documents, str(tmp_path), corpus_hash="abc")
+        create_local_store(sample_documents[:1], str(tmp_path))
+
+        assert load_local_store(str(tmp_path), corpus_hash="abc") is None
+
+    @patch("src.retriever.local_store.get_embeddings")
+    def test_interrupted_save_invalidates_corpus_hash(
+        self, mock_get_embeddings, sample_documents, tmp_path
+    ):
+        """A save that fails part-way must not leave the old hash vouching for new files."""
+        mock_get_embeddings.return_value = KeywordEmbeddings()
+        store = create_local_store(sample_documents, str(tmp_path), corpus_hash="abc")
+
+        with patch("src.retriever.local_store.pickle.dump", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                store.save(str(tmp_path), corpus_hash="abc")
+
+        assert load_local_store(str(tmp_path), corpus_hash="abc") is None
+        assert not list(tmp_path.glob("*.tmp"))
@@ -2,12 +2,31 @@
 Tests for src/rag/chain.py
 Covers: build_rag_chain, ask_question
 """
-from unittest.mock import MagicMock, patch
+import asyncio
+import pickle
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from langchain_core.documents import Document
+from hypothesis import given, seed, strategies as st
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable
 
-from src.rag.chain import HR_PROMPT_TEMPLATE, ask_question, build_rag_chain
+from src.rag import SemanticCache
+from src.rag.chain import (
+    HR_PROMPT_TEMPLATE,
+    HR_SYSTEM_PREFIX,
+    _DEFAULT_PROMPT,
+    aask_question,
+    aask_question_stream,
+    aask_questions,
+    ask_many,
+    ask_question,
+    ask_question_stream,
+    ask_questions,
+    build_rag_chain,
+)
+from tests._stubs import KeywordEmbeddings, StubBuild, StubChain
 
 
 # ---------------------------------------------------------------------------
@@ -16,95 +35,516 @@ from src.rag.chain import HR_PROMPT_TEMPLATE, ask_question, build_rag_chain
 
 class TestBuildRagChain:
     def test_returns_a_runnable(self, mock_vector_store, mock_llm):
-        """build_rag_chain must return something invokable."""
+        """build_rag_chain must return a Runnable, so batch/abatch are available."""
         chain = build_rag_chain(mock_vector_store, mock_llm)
-        assert callable(getattr(chain, "invoke", None))
+        assert isinstance(chain, Runnable)
 
-    def test_sets_retriever_with_correct_k(self, mock_vector_store, mock_llm):
-        """as_retriever must be called with the provided k value."""
-        build_rag_chain(mock_vector_store, mock_llm, k=7)
-        mock_vector_store.as_retriever.assert_called_once_with(search_kwargs={"k": 7})
+    @pytest.mark.parametrize("k_arg, expected_k", [(None, 5), (7, 7), (1, 1)])
+    def test_retriever_k(self, mock_vector_store, mock_llm, k_arg, expected_k):
+        """as_retriever must get the provided k, or 5 when k is not supplied."""
+        build_rag_chain(mock_vector_store, mock_llm, **({"k": k_arg} if k_arg else {}))
+        mock_vector_store.as_retriever.assert_called_once_with(
+            search_kwargs={"k": expected_k}
+        )
+
+    def test_retriever_uses_ann_search_kwargs(self, mock_vector_store, mock_llm):
+        """ann_params should be merged into the retriever's search kwargs."""
+        build_rag_chain(mock_vector_store, mock_llm, k=4, ann_params={"fetch_k": 16})
+        mock_vector_store.as_retriever.assert_called_once_with(
+            search_kwargs={"k": 4, "fetch_k": 16}
+        )
+
+    def test_nprobe_rejected_for_non_faiss_store(self, mock_vector_store, mock_llm):
+        """nprobe has no effect outside FAISS, so asking for it should fail loudly."""
+        with pytest.raises(ValueError, match="nprobe"):
+            build_rag_chain(mock_vector_store, mock_llm, ann_params={"nprobe": 8})
 
-    def test_default_k_is_five(self, mock_vector_store, mock_llm):
-        """When k is not supplied the default should be 5."""
-        build_rag_chain(mock_vector_store, mock_llm)
-        mock_vector_store.as_retriever.assert_called_once_with(search_kwargs={"k": 5})
+    def test_retriever_reused_across_builds_same_k(self, mock_vector_store, mock_llm):
+        """Chains sharing a store and k should share one retriever."""
+        first = build_rag_chain(mock_vector_store, mock_llm, k=7)
+        second = build_rag_chain(
+            mock_vector_store, mock_llm, k=7, prompt_template="{context} {input}"
+        )
+
+        assert mock_vector_store.as_retriever.call_count == 1
+        assert first.retriever is second.retriever
 
     def test_custom_prompt_template_is_accepted(self, mock_vector_store, mock_llm):
-        """A custom prompt template should not raise."""
+        """A custom prompt template should be used to render the prompt."""
         custom_tpl = "Custom prompt: {context}\nQ: {input}"
         chain = build_rag_chain(
             mock_vector_store, mock_llm, prompt_template=custom_tpl
         )
-        assert chain is not None
+        chain.invoke("Who?")
+        assert mock_llm.invoke.call_args.args[0].startswith("Custom prompt: ")
+
+    def test_answers_with_retrieved_context(self, mock_vector_store, mock_llm, sample_documents):
+        """Invoking the chain should prompt the LLM with the retrieved text and query."""
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        answer = chain.invoke("Who knows Python?")
+
+        prompt = mock_llm.invoke.call_args.args[0]
+        for doc in sample_documents:
+            assert doc.page_content in prompt
+        assert "Question: Who knows Python?" in prompt
+        assert answer == "Mocked LLM answer."
+
+    def test_dict_payload_returns_answer_and_context(
+        self, mock_vector_store, mock_llm, sample_documents
+    ):
+        """An {"input": ...} payload should return the answer with its sources."""
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        result = chain.invoke({"input": "Who knows Python?"})
+
+        assert result == {
+            "input": "Who knows Python?",
+            "context": sample_documents,
+            "answer": "Mocked LLM answer.",
+        }
+        assert "Question: Who knows Python?" in mock_llm.invoke.call_args.args[0]
+
+    def test_chain_is_picklable(self, sample_documents):
+        """A chain over the local store should survive a pickle round trip."""
+        cloudpickle = pytest.importorskip("cloudpickle")
+        from langchain_core.language_models.fake import FakeListLLM
+
+        from src.retriever import LocalVectorStore
+
+        store = LocalVectorStore.from_documents(sample_documents, KeywordEmbeddings())
+        chain = build_rag_chain(store, FakeListLLM(responses=["Alice."]), k=1)
+
+        restored = pickle.loads(cloudpickle.dumps(chain))
+
+        result = restored.invoke({"input": "django"})
+        assert result["answer"] == "Alice."
+        assert result["context"][0].metadata["source"] == "alice_resume.pdf"
+
+    def test_accepts_plain_string_llm_output(self, mock_vector_store, mock_llm):
+        """LLMs returning a bare string (not a message) should be passed through."""
+        mock_llm.invoke.return_value = "Plain answer."
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+        assert chain.invoke("Q?") == "Plain answer."
+
+    def test_stream_yields_llm_chunks(self, mock_vector_store, mock_llm):
+        """stream() should yield the LLM's chunks as they are produced."""
+        mock_llm.stream.return_value = iter(
+            [MagicMock(content="Alice "), MagicMock(content="knows Python.")]
+        )
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        assert list(chain.stream("Who knows Python?")) == ["Alice ", "knows Python."]
+        assert "Who knows Python?" in mock_llm.stream.call_args.args[0]
+
+    def test_stream_dict_payload_yields_context_then_answer(
+        self, mock_vector_store, mock_llm, sample_documents
+    ):
+        """stream({"input": ...}) should yield the sources, then answer pieces."""
+        mock_llm.stream.return_value = iter(
+            [MagicMock(content="Alice "), MagicMock(content="knows Python.")]
+        )
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        assert list(chain.stream({"input": "Who knows Python?"})) == [
+            {"input": "Who knows Python?", "context": sample_documents},
+            {"answer": "Alice "},
+            {"answer": "knows Python."},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_astream_dict_payload_yields_context_then_answer(
+        self, mock_vector_store, mock_llm, sample_documents
+    ):
+        """astream({"input": ...}) should mirror stream() for dict payloads."""
+        retriever = mock_vector_store.as_retriever.return_value
+        retriever.ainvoke = AsyncMock(return_value=sample_documents)
+
+        async def fake_astream(prompt):
+            for piece in ("Bob ", "does."):
+                yield MagicMock(content=piece)
+
+        mock_llm.astream.side_effect = fake_astream
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        chunks = [c async for c in chain.astream({"input": "Who uses pandas?"})]
+
+        assert chunks == [
+            {"input": "Who uses pandas?", "context": sample_documents},
+            {"answer": "Bob "},
+            {"answer": "does."},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_uses_async_retriever_and_llm(
+        self, mock_vector_store, mock_llm, sample_documents
+    ):
+        """ainvoke should await the retriever and LLM rather than block on them."""
+        retriever = mock_vector_store.as_retriever.return_value
+        retriever.ainvoke = AsyncMock(return_value=sample_documents)
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="Async answer."))
+        chain = build_rag_chain(mock_vector_store, mock_llm)
+
+        answer = await chain.ainvoke("Who knows Python?")
+
+        assert answer == "Async answer."
+        retriever.ainvoke.assert_awaited_once_with("Who knows Python?")
+        retriever.invoke.assert_not_called()
+        assert sample_documents[0].page_content in mock_llm.ainvoke.call_args.args[0]
+
+    def test_similarity_retriever_is_searched_directly(self, mock_llm, sample_documents):
+        """A plain similarity retriever should be fused into a direct store search."""
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        from src.retriever import LocalVectorStore
+
+        store = LocalVectorStore.from_documents(
+            sample_documents, DeterministicFakeEmbedding(size=32)
+        )
+        chain = build_rag_chain(store, mock_llm, k=1)
+        query = sample_documents[1].page_content
+
+        with patch.object(type(chain.retriever), "invoke") as mock_invoke:
+            chain.invoke(query)
+
+        mock_invoke.assert_not_called()
+        prompt = mock_llm.invoke.call_args.args[0]
+        assert f"Context: {sample_documents[1].page_content}\n" in prompt
+        assert sample_documents[0].page_content not in prompt.split("Question:")[0]
+
+    def test_default_prompt_object_is_singleton(self, mock_vector_store, mock_llm):
+        """Chains using the default template should share one parsed prompt."""
+        first = build_rag_chain(mock_vector_store, mock_llm, k=3)
+        second = build_rag_chain(mock_vector_store, mock_llm, k=4)
+
+        assert first.prompt is second.prompt is _DEFAULT_PROMPT
+        assert set(first.prompt.input_variables) == {"context", "input"}
+
+    def test_template_without_required_slot_is_rejected(self, mock_vector_store, mock_llm):
+        """A template lacking {context} should fail at build time, not per query."""
+        with pytest.raises(ValueError, match="context"):
+            build_rag_chain(mock_vector_store, mock_llm, prompt_template="Q: {input}")
 
     def test_hr_prompt_template_contains_required_slots(self):
         """The default HR prompt must include {context} and {input} placeholders."""
         assert "{context}" in HR_PROMPT_TEMPLATE
         assert "{input}" in HR_PROMPT_TEMPLATE
 
+    @seed(0)
+    @given(ctx=st.text(), q=st.text())
+    def test_hr_prompt_formats(self, ctx, q):
+        """Any context and question text should drop into the slots verbatim."""
+        expected = f"{HR_SYSTEM_PREFIX}Context: {ctx}\n\nQuestion: {q}"
+
+        assert PromptTemplate.from_template(HR_PROMPT_TEMPLATE).format(
+            context=ctx, input=q
+        ) == expected
+        # FastRAG renders with str.format; it must agree with PromptTemplate.
+        assert HR_PROMPT_TEMPLATE.format(context=ctx, input=q) == expected
+
+    def test_static_prefix_precedes_dynamic_slots(self):
+        """The cacheable prefix must be static and come before every slot."""
+        assert HR_PROMPT_TEMPLATE.startswith(HR_SYSTEM_PREFIX)
+        assert "{" not in HR_SYSTEM_PREFIX and "}" not in HR_SYSTEM_PREFIX
+        assert HR_PROMPT_TEMPLATE.index("{context}") >= len(HR_SYSTEM_PREFIX)
+        assert HR_PROMPT_TEMPLATE.index("{context}") < HR_PROMPT_TEMPLATE.index("{input}")
+        assert HR_PROMPT_TEMPLATE.endswith("{input}")
+
 
 # ---------------------------------------------------------------------------
 # ask_question
 # ---------------------------------------------------------------------------
 
 class TestAskQuestion:
-    def test_returns_string(self, mock_vector_store, mock_llm):
+    def test_returns_string(self, mock_vector_store, mock_llm, monkeypatch):
         """ask_question should return a plain string."""
-        # Patch the entire chain so we don't hit external services
-        with patch("src.rag.chain.build_rag_chain") as mock_build:
-            mock_chain = MagicMock()
-            mock_chain.invoke.return_value = "Alice is the best Python developer."
-            mock_build.return_value = mock_chain
+        # Stub out the chain so we don't hit external services
+        build = StubBuild(StubChain("Alice is the best Python developer."))
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
 
-            result = ask_question("Who knows Python?", mock_vector_store, mock_llm)
+        result = ask_question("Who knows Python?", mock_vector_store, mock_llm)
 
         assert isinstance(result, str)
 
-    def test_invokes_chain_with_query(self, mock_vector_store, mock_llm):
-        """The query must be forwarded to chain.invoke."""
+    def test_invokes_chain_with_query(self, mock_vector_store, mock_llm, monkeypatch):
+        """The query must be forwarded to chain.invoke as an {"input": ...} payload."""
         query = "Which candidate has Django experience?"
-        with patch("src.rag.chain.build_rag_chain") as mock_build:
-            mock_chain = MagicMock()
-            mock_chain.invoke.return_value = "Alice does."
-            mock_build.return_value = mock_chain
+        chain = StubChain("Alice does.")
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", StubBuild(chain))
+
+        ask_question(query, mock_vector_store, mock_llm)
+
+        assert chain.calls == [{"input": query}]
 
-            ask_question(query, mock_vector_store, mock_llm)
+    def test_ask_question_extracts_answer_field(self, mock_vector_store, mock_llm, monkeypatch):
+        """Only the "answer" field of the chain output should be returned."""
+        mock_chain = MagicMock()
+        mock_chain.invoke.return_value = {"answer": "x", "context": ["doc"]}
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", StubBuild(mock_chain))
 
-            mock_chain.invoke.assert_called_once_with(query)
+        assert ask_question("Q?", mock_vector_store, mock_llm) == "x"
+        mock_chain.invoke.assert_called_once_with({"input": "Q?"})
 
-    def test_passes_k_to_build_rag_chain(self, mock_vector_store, mock_llm):
+    def test_passes_k_to_build_rag_chain(self, mock_vector_store, mock_llm, monkeypatch):
         """The k parameter must be forwarded when building the chain."""
+        build = StubBuild(StubChain("Answer"))
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        ask_question("Q?", mock_vector_store, mock_llm, k=3)
+
+        _, kwargs = build.calls[-1]
+        assert kwargs["k"] == 3
+
+    def test_returns_answer_from_chain(self, mock_vector_store, mock_llm, monkeypatch):
+        """The exact string returned by the chain should be passed through."""
+        expected = "Bob has the strongest data science background."
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", StubBuild(StubChain(expected)))
+
+        result = ask_question("Best data scientist?", mock_vector_store, mock_llm)
+
+        assert result == expected
+
+    def test_ask_question_is_idempotent_and_cached(
+        self, mock_vector_store, mock_llm, monkeypatch
+    ):
+        """Repeated calls with the same store, LLM and k should build one chain."""
+        chain = StubChain("ok")
+        build = StubBuild(chain)
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        answers = [ask_question(f"Q{i}", mock_vector_store, mock_llm) for i in range(5)]
+
+        assert build.call_count == 1
+        assert answers == ["ok"] * 5
+        assert chain.calls == [{"input": f"Q{i}"} for i in range(5)]
+
+    def test_rebuild_on_vector_store_change(self, mock_llm, monkeypatch):
+        """A different vector store must get its own chain."""
+        build = StubBuild(StubChain("ok"))
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        ask_question("Q1", MagicMock(), mock_llm)
+        ask_question("Q2", MagicMock(), mock_llm)
+
+        assert build.call_count == 2
+
+    def test_rebuilds_chain_when_k_changes(self, mock_vector_store, mock_llm, monkeypatch):
+        """A different k is a different chain; each k should be built once."""
+        build = StubBuild(StubChain("ok"))
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        ask_question("Q1", mock_vector_store, mock_llm, k=3)
+        ask_question("Q2", mock_vector_store, mock_llm, k=7)
+        ask_question("Q3", mock_vector_store, mock_llm, k=3)
+
+        assert [kwargs["k"] for _, kwargs in build.calls] == [3, 7]
+
+    def test_cache_hit_skips_chain(self, mock_vector_store, mock_llm, monkeypatch):
+        """A repeated question should be answered from the semantic cache."""
+        cache = SemanticCache(lambda text: [1.0, 0.0])
+        chain = StubChain("Alice.")
+        build = StubBuild(chain)
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        first = ask_question("Who knows Python?", mock_vector_store, mock_llm, cache=cache)
+        second = ask_question("Who knows Python?", mock_vector_store, mock_llm, cache=cache)
+
+        assert first == second == "Alice."
+        assert build.call_count == 1
+        assert chain.calls == [{"input": "Who knows Python?"}]
+
+    def test_cache_miss_on_dissimilar_query(self, mock_vector_store, mock_llm, monkeypatch):
+        """An unrelated question must still go through the chain."""
+        vectors = {"Who knows Python?": [1.0, 0.0], "Who knows pandas?": [0.0, 1.0]}
+        cache = SemanticCache(vectors.__getitem__)
+        chain = StubChain("Alice.", "Bob.")
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", StubBuild(chain))
+
+        ask_question("Who knows Python?", mock_vector_store, mock_llm, cache=cache)
+        answer = ask_question("Who knows pandas?", mock_vector_store, mock_llm, cache=cache)
+
+        assert answer == "Bob."
+        assert len(chain.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_aask_questions_batches_through_one_chain(
+        self, mock_vector_store, mock_llm, monkeypatch
+    ):
+        """aask_questions should build one chain and answer every query from it."""
+        queries = ["Who knows Python?", "Who knows pandas?", "Who knows Java?"]
+        chain = StubChain("Alice.", "Bob.", "Carol.")
+        build = StubBuild(chain)
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        result = await aask_questions(queries, mock_vector_store, mock_llm)
+
+        assert build.call_count == 1
+        assert chain.calls == queries
+        assert result == ["Alice.", "Bob.", "Carol."]
+
+    def test_ask_questions_runs_batch_synchronously(
+        self, mock_vector_store, mock_llm, monkeypatch
+    ):
+        """The sync wrapper should return answers in query order."""
+        chain = StubChain("one", "two")
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", StubBuild(chain))
+
+        result = ask_questions(["Q1", "Q2"], mock_vector_store, mock_llm, max_concurrency=2)
+
+        assert result == ["one", "two"]
+        assert chain.config == {"max_concurrency": 2}
+
+    def test_ask_questions_with_no_queries(self, mock_vector_store, mock_llm, monkeypatch):
+        """An empty batch should not build a chain."""
+        build = StubBuild(StubChain("unused"))
+        monkeypatch.setattr("src.rag.chain.build_rag_chain", build)
+
+        assert ask_questions([], mock_vector_store, mock_llm) == []
+        assert build.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_fast_rag_abatch_runs_queries_concurrently(self, sample_documents):
+        """FastRAG.abatch should overlap LLM calls rather than run them in turn."""
+        in_flight = peak = 0
+
+        async def slow_llm(prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "ok"
+
+        retriever = MagicMock()
+        retriever.ainvoke = AsyncMock(return_value=sample_documents)
+        llm = MagicMock()
+        llm.ainvoke = slow_llm
+        store = MagicMock()
+        store.as_retriever.return_value = retriever
+
+        answers = await aask_questions(["a", "b", "c", "d"], store, llm)
+
+        assert answers == ["ok"] * 4
+        assert peak == 4
+
+
+# ---------------------------------------------------------------------------
+# ask_many
+# ---------------------------------------------------------------------------
+
+class TestAskQuestionConcurrency:
+    @pytest.fixture
+    def queries(self):
+        return [f"Who has skill {i}?" for i in range(64)]
+
+    @pytest.fixture
+    def slow_llm(self, mock_vector_store, mock_llm, sample_documents):
+        """Make the real chain's LLM call take 10 ms and track peak concurrency."""
+        retriever = mock_vector_store.as_retriever.return_value
+        retriever.ainvoke = AsyncMock(return_value=sample_documents)
+        mock_llm.in_flight = mock_llm.peak = 0
+
+        async def ainvoke(prompt):
+            mock_llm.in_flight += 1
+            mock_llm.peak = max(mock_llm.peak, mock_llm.in_flight)
+            await asyncio.sleep(0.01)
+            mock_llm.in_flight -= 1
+            return prompt.rsplit("Question: ", 1)[1]
+
+        mock_llm.ainvoke = AsyncMock(side_effect=ainvoke)
+        return mock_llm
+
+    @pytest.mark.asyncio
+    async def test_overlaps_calls(self, queries, slow_llm, mock_vector_store):
+        """64 calls of 10 ms should finish far faster than running them in turn."""
+        start = time.perf_counter()
+        answers = await ask_many(queries, mock_vector_store, slow_llm)
+        elapsed = time.perf_counter() - start
+
+        assert answers == queries
+        assert slow_llm.ainvoke.await_count == len(queries)
+        assert elapsed < len(queries) * 0.01 / 4
+
+    @pytest.mark.asyncio
+    async def test_respects_max_concurrency(self, queries, slow_llm, mock_vector_store):
+        """No more than max_concurrency questions should be in flight at once."""
+        await ask_many(queries, mock_vector_store, slow_llm, max_concurrency=5)
+        assert slow_llm.peak == 5
+
+    def test_exported_from_package(self):
+        """ask_many must be importable from src.rag and listed in __all__."""
+        import src.rag
+
+        assert src.rag.ask_many is ask_many
+        assert all(hasattr(src.rag, name) for name in src.rag.__all__)
+
+
+# ---------------------------------------------------------------------------
+# ask_question_stream
+# ---------------------------------------------------------------------------
+
+class TestAskQuestionStream:
+    def test_yields_chunks_from_chain(self, mock_vector_store, mock_llm):
+        """Chunks produced by chain.stream should be yielded unchanged."""
         with patch("src.rag.chain.build_rag_chain") as mock_build:
             mock_chain = MagicMock()
-            mock_chain.invoke.return_value = "Answer"
+            mock_chain.stream.return_value = iter(["Bob ", "does."])
             mock_build.return_value = mock_chain
 
-            ask_question("Q?", mock_vector_store, mock_llm, k=3)
+            chunks = list(ask_question_stream("Who uses pandas?", mock_vector_store, mock_llm))
 
-            _, kwargs = mock_build.call_args
-            assert kwargs["k"] == 3
+        assert chunks == ["Bob ", "does."]
+        mock_chain.stream.assert_called_once_with("Who uses pandas?")
 
-    def test_returns_answer_from_chain(self, mock_vector_store, mock_llm):
-        """The exact string returned by the chain should be passed through."""
-        expected = "Bob has the strongest data science background."
+
+# ---------------------------------------------------------------------------
+# aask_question / aask_question_stream
+# ---------------------------------------------------------------------------
+
+class TestAsyncAskQuestion:
+    @pytest.mark.asyncio
+    async def test_aask_question_uses_ainvoke(self, mock_vector_store, mock_llm):
+        """aask_question should await chain.ainvoke with an {"input": ...} payload."""
         with patch("src.rag.chain.build_rag_chain") as mock_build:
             mock_chain = MagicMock()
-            mock_chain.invoke.return_value = expected
+            mock_chain.ainvoke = AsyncMock(
+                return_value={"input": "Who knows Django?", "context": [], "answer": "Alice does."}
+            )
             mock_build.return_value = mock_chain
 
-            result = ask_question("Best data scientist?", mock_vector_store, mock_llm)
+            result = await aask_question("Who knows Django?", mock_vector_store, mock_llm)
 
-        assert result == expected
+        assert result == "Alice does."
+        mock_chain.ainvoke.assert_awaited_once_with({"input": "Who knows Django?"})
+        mock_chain.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aask_question_end_to_end(self, mock_vector_store, mock_llm, sample_documents):
+        """Through a real FastRAG, aask_question should use the async retriever and LLM."""
+        retriever = mock_vector_store.as_retriever.return_value
+        retriever.ainvoke = AsyncMock(return_value=sample_documents)
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="Async answer."))
+
+        result = await aask_question("Who knows pandas?", mock_vector_store, mock_llm)
+
+        assert result == "Async answer."
+        retriever.invoke.assert_not_called()
+        mock_llm.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aask_question_stream_yields_chunks(self, mock_vector_store, mock_llm):
+        """aask_question_stream should relay chunks from chain.astream."""
+        async def fake_astream(query):
+            for chunk in ("Bob ", "does."):
+                yield chunk
 
-    def test_builds_new_chain_on_each_call(self, mock_vector_store, mock_llm):
-        """A new chain should be built for each ask_question call."""
         with patch("src.rag.chain.build_rag_chain") as mock_build:
             mock_chain = MagicMock()
-            mock_chain.invoke.return_value = "ok"
+            mock_chain.astream = fake_astream
             mock_build.return_value = mock_chain
 
-            ask_question("Q1", mock_vector_store, mock_llm)
-            ask_question("Q2", mock_vector_store, mock_llm)
+            chunks = [
+                c async for c in aask_question_stream("Who uses pandas?", mock_vector_store, mock_llm)
+            ]
 
-        assert mock_build.call_count == 2
\ No newline at end of file
+        assert chunks == ["Bob ", "does."]
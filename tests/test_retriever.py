@@ -11,6 +11,13 @@ from src.retriever import create_vector_store, load_vector_store
 from src.retriever.vector_store import _ensure_index_exists
 
 
+def _fake_embeddings():
+    """MagicMock embedding model returning one 384-d vector per text."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+    return embeddings
+
+
 # ---------------------------------------------------------------------------
 # _ensure_index_exists
 # ---------------------------------------------------------------------------
@@ -65,9 +72,9 @@ class TestCreateVectorStore:
         mock_pc.list_indexes.return_value = [MagicMock(name="resumes-index")]
         MockPinecone.return_value = mock_pc
 
-        mock_get_embeddings.return_value = MagicMock()
+        mock_get_embeddings.return_value = _fake_embeddings()
         mock_store = MagicMock()
-        MockVectorStore.from_documents.return_value = mock_store
+        MockVectorStore.return_value = mock_store
 
         result = create_vector_store(
             chunks=sample_chunks,
@@ -80,15 +87,15 @@ class TestCreateVectorStore:
     @patch("src.retriever.vector_store.PineconeVectorStore")
     @patch("src.retriever.vector_store.get_embeddings")
     @patch("src.retriever.vector_store.Pinecone")
-    def test_calls_from_documents_with_chunks(
+    def test_upserts_every_chunk_with_its_text(
         self, MockPinecone, mock_get_embeddings, MockVectorStore, sample_chunks
     ):
-        """from_documents must receive the chunks list."""
+        """Each chunk must be upserted once, carrying its text in metadata."""
         mock_pc = MagicMock()
         mock_pc.list_indexes.return_value = []
         MockPinecone.return_value = mock_pc
-        mock_get_embeddings.return_value = MagicMock()
-        MockVectorStore.from_documents.return_value = MagicMock()
+        mock_embeddings = _fake_embeddings()
+        mock_get_embeddings.return_value = mock_embeddings
 
         create_vector_store(
             chunks=sample_chunks,
@@ -96,8 +103,51 @@ class TestCreateVectorStore:
             pinecone_api_key="key",
         )
 
-        call_kwargs = MockVectorStore.from_documents.call_args[1]
-        assert call_kwargs["documents"] is sample_chunks
+        index = mock_pc.Index.return_value
+        upserted = [v for c in index.upsert.call_args_list for v in c.kwargs["vectors"]]
+        assert [meta["text"] for _, _, meta in upserted] == [
+            c.page_content for c in sample_chunks
+        ]
+
+    @patch("src.retriever.vector_store.PineconeVectorStore")
+    @patch("src.retriever.vector_store.get_embeddings")
+    @patch("src.retriever.vector_store.Pinecone")
+    def test_embeds_in_batches(
+        self, MockPinecone, mock_get_embeddings, MockVectorStore, sample_chunks
+    ):
+        """Chunks should be embedded batch_size at a time, not one by one."""
+        mock_pc = MagicMock()
+        mock_pc.list_indexes.return_value = []
+        MockPinecone.return_value = mock_pc
+        mock_embeddings = _fake_embeddings()
+        mock_get_embeddings.return_value = mock_embeddings
+
+        create_vector_store(sample_chunks, "idx", pinecone_api_key="key", batch_size=2)
+
+        batch_sizes = [len(c.args[0]) for c in mock_embeddings.embed_documents.call_args_list]
+        assert sum(batch_sizes) == len(sample_chunks)
+        assert all(size <= 2 for size in batch_sizes)
+
+    @patch("src.retriever.vector_store.PineconeVectorStore")
+    @patch("src.retriever.vector_store.get_embeddings")
+    @patch("src.retriever.vector_store.Pinecone")
+    def test_upserts_asynchronously_and_waits_for_all(
+        self, MockPinecone, mock_get_embeddings, MockVectorStore, sample_chunks
+    ):
+        """Every batch should be sent with async_req=True and awaited before returning."""
+        mock_pc = MagicMock()
+        mock_pc.list_indexes.return_value = []
+        MockPinecone.return_value = mock_pc
+        mock_get_embeddings.return_value = _fake_embeddings()
+        index = mock_pc.Index.return_value
+        results = [MagicMock() for _ in sample_chunks]
+        index.upsert.side_effect = results
+
+        create_vector_store(sample_chunks, "idx", pinecone_api_key="key", batch_size=1)
+
+        assert all(c.kwargs["async_req"] is True for c in index.upsert.call_args_list)
+        for result in results:
+            result.get.assert_called_once()
 
     @patch("src.retriever.vector_store.PineconeVectorStore")
     @patch("src.retriever.vector_store.get_embeddings")
@@ -109,8 +159,8 @@ class TestCreateVectorStore:
         mock_pc = MagicMock()
         mock_pc.list_indexes.return_value = []
         MockPinecone.return_value = mock_pc
-        mock_get_embeddings.return_value = MagicMock()
-        MockVectorStore.from_documents.return_value = MagicMock()
+        mock_get_embeddings.return_value = _fake_embeddings()
+        MockVectorStore.return_value = MagicMock()
 
         create_vector_store(sample_chunks, "idx", pinecone_api_key="secret-key")
 
@@ -144,15 +194,29 @@ class TestLoadVectorStore:
     def test_passes_correct_index_name(
         self, MockPinecone, mock_get_embeddings, MockVectorStore
     ):
-        """The index_name must be forwarded to PineconeVectorStore constructor."""
+        """The store must wrap a handle to the requested index."""
         MockPinecone.return_value = MagicMock()
         mock_get_embeddings.return_value = MagicMock()
         MockVectorStore.return_value = MagicMock()
 
         load_vector_store("target-index", "key")
 
+        MockPinecone.return_value.Index.assert_called_once_with("target-index")
         _, kwargs = MockVectorStore.call_args
-        assert kwargs["index_name"] == "target-index"
+        assert kwargs["index"] is MockPinecone.return_value.Index.return_value
+
+    @patch("src.retriever.vector_store.PineconeVectorStore")
+    @patch("src.retriever.vector_store.get_embeddings")
+    @patch("src.retriever.vector_store.Pinecone")
+    def test_reuses_pinecone_client_per_api_key(
+        self, MockPinecone, mock_get_embeddings, MockVectorStore
+    ):
+        """Repeated loads with the same key should share one Pinecone client."""
+        load_vector_store("index-a", "key")
+        load_vector_store("index-b", "key")
+        load_vector_store("index-a", "other-key")
+
+        assert MockPinecone.call_count == 2
 
     @patch("src.retriever.vector_store.PineconeVectorStore")
     @patch("src.retriever.vector_store.get_embeddings")
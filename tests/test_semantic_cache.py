@@ -0,0 +1,69 @@
+"""
+Tests for src/rag/cache.py
+Covers: SemanticCache
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.rag import SemanticCache
+
+VECTORS = {
+    "Who knows Python?": [1.0, 0.0, 0.0],
+    "Find Python devs": [0.99, 0.1, 0.0],
+    "Who knows pandas?": [0.0, 1.0, 0.0],
+    "Who knows Java?": [0.0, 0.0, 1.0],
+}
+
+
+@pytest.fixture
+def embed_fn():
+    return MagicMock(side_effect=lambda text: VECTORS[text])
+
+
+class TestSemanticCache:
+    def test_empty_cache_misses(self, embed_fn):
+        """Nothing is cached before the first put()."""
+        assert SemanticCache(embed_fn).get("Who knows Python?") is None
+
+    def test_hit_on_similar_query(self, embed_fn):
+        """A paraphrase above the threshold should return the stored answer."""
+        cache = SemanticCache(embed_fn, threshold=0.95)
+        cache.put("Who knows Python?", "Alice.")
+
+        assert cache.get("Find Python devs") == "Alice."
+
+    def test_miss_below_threshold(self, embed_fn):
+        """An unrelated query must not reuse another question's answer."""
+        cache = SemanticCache(embed_fn, threshold=0.95)
+        cache.put("Who knows Python?", "Alice.")
+
+        assert cache.get("Who knows pandas?") is None
+
+    def test_miss_then_put_embeds_query_once(self, embed_fn):
+        """The vector from a missed lookup should be reused by put()."""
+        cache = SemanticCache(embed_fn)
+        cache.get("Who knows pandas?")
+        cache.put("Who knows pandas?", "Bob.")
+
+        embed_fn.assert_called_once_with("Who knows pandas?")
+
+    def test_evicts_oldest_entry_when_full(self, embed_fn):
+        """With maxsize entries stored, the next put() replaces the oldest."""
+        cache = SemanticCache(embed_fn, maxsize=2)
+        cache.put("Who knows Python?", "Alice.")
+        cache.put("Who knows pandas?", "Bob.")
+        cache.put("Who knows Java?", "Carol.")
+
+        assert len(cache) == 2
+        assert cache.get("Who knows Python?") is None
+        assert cache.get("Who knows Java?") == "Carol."
+
+    def test_clear_drops_answers(self, embed_fn):
+        """clear() should leave the cache empty."""
+        cache = SemanticCache(embed_fn)
+        cache.put("Who knows Python?", "Alice.")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("Who knows Python?") is None